@@ -21,7 +21,6 @@ import zope.component
 import zope.interface
 import zope.schema
 import zope.schema.interfaces
-from zope.i18n import translate
 from zope.schema import vocabulary
 
 from z3c.form import interfaces
@@ -47,12 +46,11 @@ class CheckBoxWidget(widget.HTMLInputWidget, SequenceWidget):
         if self.terms is None:
             return ()
         items = []
-        for count, term_ in enumerate(self.terms):
+        for count, term_ in enumerate(self.getVisibleTerms()):
             checked = self.isChecked(term_)
             id = '%s-%i' % (self.id, count)
             if zope.schema.interfaces.ITitledTokenizedTerm.providedBy(term_):
-                label = translate(term_.title, context=self.request,
-                                  default=term_.title)
+                label = util.translateTitle(term_.title, self.request)
             else:
                 label = util.toUnicode(term_.value)
             items.append(
@@ -67,7 +65,7 @@ class CheckBoxWidget(widget.HTMLInputWidget, SequenceWidget):
 
     def json_data(self):
         data = super().json_data()
-        data['options'] = list(self.items)
+        self.addJSONOptions(data)
         data['type'] = 'check'
         return data
 
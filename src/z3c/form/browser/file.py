@@ -21,8 +21,18 @@ import zope.interface
 import zope.schema.interfaces
 
 from z3c.form import interfaces
+from z3c.form import util
 from z3c.form import widget
 from z3c.form.browser import text
+from z3c.form.i18n import MessageFactory as _
+
+
+class FileTooLarge(zope.schema.ValidationError):
+    __doc__ = _('The file is too large.')
+
+
+class ContentTypeNotAllowed(zope.schema.ValidationError):
+    __doc__ = _('Files of this type cannot be uploaded.')
 
 
 @zope.interface.implementer_only(interfaces.IFileWidget)
@@ -36,6 +46,34 @@ class FileWidget(text.TextWidget):
     # widget provided by the FileUpload object of the form.
     headers = None
     filename = None
+    streamed = False
+    maxSize = None
+    allowedContentTypes = None
+    sniffSize = 4096
+
+    def checkUpload(self, upload):
+        """See z3c.form.interfaces.IFileWidget"""
+        if self.maxSize is not None:
+            size = util.getFileSize(upload)
+            if size > self.maxSize:
+                raise FileTooLarge(size, self.maxSize)
+        if self.allowedContentTypes is None:
+            return
+        headers = getattr(upload, 'headers', None) or {}
+        contentType = headers.get('Content-Type')
+        if contentType and not util.matchesContentType(
+                contentType, self.allowedContentTypes):
+            raise ContentTypeNotAllowed(contentType)
+        # Do not trust the header alone, but look at the data as well.
+        upload.seek(0)
+        sniffed = util.sniffContentType(upload.read(self.sniffSize))
+        upload.seek(0)
+        if sniffed is not None and not util.matchesContentType(
+                sniffed, self.allowedContentTypes):
+            raise ContentTypeNotAllowed(sniffed)
+        if not contentType and sniffed is None:
+            # Neither the client nor the data tell the type of the file.
+            raise ContentTypeNotAllowed(None)
 
     def json_data(self):
         data = super().json_data()
@@ -192,6 +192,13 @@ class IHTMLFormElement(IHTMLCoreAttributes,
         The class must be added to the ``klass`` attribute.
         """
 
+    def renderAttributes(out=None):
+        """Render the non-empty HTML attributes of the element.
+
+        The escaped attributes are written to ``out``, a file-like object, if
+        given. Otherwise they are returned as a string.
+        """
+
 
 class IHTMLInputWidget(IHTMLFormElement):
     """A widget using the HTML INPUT element."""
@@ -50,13 +50,24 @@ class MultiWidget(HTMLFormElement, widget.MultiWidget, FormMixin):
     _adapterValueAttributes = widget.MultiWidget._adapterValueAttributes + \
         ('showLabel',)
 
+    actions = None
+    _actionsState = None
+
     def updateActions(self):
         self.updateAllowAddRemove()
         if self.name is not None:
             self.prefix = self.name
-        self.actions = zope.component.getMultiAdapter(
-            (self, self.request, self), interfaces.IActions)
+        # The add/remove actions only depend on the prefix and on the
+        # allowAdding/allowRemoving conditions, so the action manager is
+        # reused and only updated if one of them changed.
+        state = (self.prefix, self.allowAdding, self.allowRemoving)
+        if self.actions is None or self.actions.request is not self.request:
+            self.actions = zope.component.getMultiAdapter(
+                (self, self.request, self), interfaces.IActions)
+        elif state == self._actionsState:
+            return
         self.actions.update()
+        self._actionsState = state
 
     def update(self):
         """See z3c.form.interfaces.IWidget."""
@@ -20,9 +20,9 @@ import zope.component
 import zope.interface
 import zope.schema
 import zope.schema.interfaces
-from zope.i18n import translate
 
 from z3c.form import interfaces
+from z3c.form import util
 from z3c.form.browser import widget
 from z3c.form.widget import FieldWidget
 from z3c.form.widget import SequenceWidget
@@ -42,8 +42,7 @@ class OrderedSelectWidget(widget.HTMLSelectWidget, SequenceWidget):
         id = '%s-%i' % (self.id, count)
         content = term.value
         if zope.schema.interfaces.ITitledTokenizedTerm.providedBy(term):
-            content = translate(
-                term.title, context=self.request, default=term.title)
+            content = util.translateTitle(term.title, self.request)
         return {'id': id, 'value': term.token, 'content': content}
 
     def update(self):
@@ -52,7 +51,7 @@ class OrderedSelectWidget(widget.HTMLSelectWidget, SequenceWidget):
         widget.addFieldClass(self)
         self.items = [
             self.getItem(term, count)
-            for count, term in enumerate(self.terms)]
+            for count, term in enumerate(self.getVisibleTerms())]
         self.selectedItems = [
             self.getItem(self.terms.getTermByToken(token), count)
             for count, token in enumerate(self.value)]
@@ -70,9 +69,10 @@ class OrderedSelectWidget(widget.HTMLSelectWidget, SequenceWidget):
 
     def json_data(self):
         data = super().json_data()
-        data['options'] = self.items
+        self.addJSONOptions(data)
         data['selected'] = self.selectedItems
-        data['notSelected'] = self.notselectedItems
+        if 'options' in data:
+            data['notSelected'] = self.notselectedItems
         data['type'] = 'multiSelect'
         return data
 
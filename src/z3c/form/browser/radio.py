@@ -21,7 +21,6 @@ import zope.component
 import zope.interface
 import zope.schema
 import zope.schema.interfaces
-from zope.i18n import translate
 from zope.pagetemplate.interfaces import IPageTemplate
 from zope.schema.vocabulary import SimpleTerm
 
@@ -30,6 +29,7 @@ from z3c.form import util
 from z3c.form.browser import widget
 from z3c.form.widget import FieldWidget
 from z3c.form.widget import SequenceWidget
+from z3c.form.widget import getWidgetTemplate
 
 
 @zope.interface.implementer_only(interfaces.IRadioWidget)
@@ -43,7 +43,7 @@ class RadioWidget(widget.HTMLInputWidget, SequenceWidget):
         return term.token in self.value
 
     def renderForValue(self, value):
-        terms = list(self.terms)
+        terms = list(self.getVisibleTerms())
         try:
             term = self.terms.getTermByToken(value)
         except LookupError:
@@ -54,13 +54,16 @@ class RadioWidget(widget.HTMLInputWidget, SequenceWidget):
             else:
                 raise
         else:
-            id = '%s-%i' % (self.id, terms.index(term))
+            tokens = [visible.token for visible in terms]
+            if term.token not in tokens:
+                # Only the visible terms of paged terms have an id.
+                raise LookupError(value)
+            id = '%s-%i' % (self.id, tokens.index(term.token))
         checked = self.isChecked(term)
         item = {'id': id, 'name': self.name, 'value': term.token,
                 'checked': checked}
-        template = zope.component.getMultiAdapter(
-            (self.context, self.request, self.form, self.field, self),
-            IPageTemplate, name=self.mode + '_single')
+        template = getWidgetTemplate(
+            self, IPageTemplate, self.mode + '_single')
         return template(self, item)
 
     @property
@@ -68,12 +71,11 @@ class RadioWidget(widget.HTMLInputWidget, SequenceWidget):
         if self.terms is None:
             return
 
-        for count, term in enumerate(self.terms):
+        for count, term in enumerate(self.getVisibleTerms()):
             checked = self.isChecked(term)
             id = '%s-%i' % (self.id, count)
             if zope.schema.interfaces.ITitledTokenizedTerm.providedBy(term):
-                label = translate(term.title, context=self.request,
-                                  default=term.title)
+                label = util.translateTitle(term.title, self.request)
             else:
                 label = util.toUnicode(term.value)
             yield {'id': id, 'name': self.name, 'value': term.token,
@@ -86,7 +88,7 @@ class RadioWidget(widget.HTMLInputWidget, SequenceWidget):
 
     def json_data(self):
         data = super().json_data()
-        data['options'] = list(self.items)
+        self.addJSONOptions(data)
         data['type'] = 'radio'
         return data
 
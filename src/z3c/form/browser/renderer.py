@@ -0,0 +1,417 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Single-pass renderer for the standard widgets.
+
+The renderer produces the same HTML as the page templates shipped with this
+package, without invoking the page template machinery for every widget.
+Widgets which use any other template or layout are rendered by their
+templates.
+"""
+__docformat__ = "reStructuredText"
+import functools
+import os.path
+
+import zope.interface.interfaces
+from zope.i18n import translate
+from zope.i18nmessageid import Message
+from zope.pagetemplate.interfaces import IPageTemplate
+
+from z3c.form import interfaces
+from z3c.form.browser.radio import RadioWidget
+from z3c.form.browser.widget import escapeAttribute
+from z3c.form.widget import Widget
+from z3c.form.widget import getWidgetTemplate
+
+
+# Attributes rendered as ``name="name"`` if true and omitted otherwise, like
+# page templates do in HTML mode.
+BOOLEAN_HTML_ATTRIBUTES = frozenset((
+    'checked', 'compact', 'declare', 'defer', 'disabled', 'ismap',
+    'multiple', 'noresize', 'noshade', 'nowrap', 'readonly', 'selected'))
+
+_EVENTS = (
+    'onclick', 'ondblclick', 'onmousedown', 'onmouseup', 'onmouseover',
+    'onmousemove', 'onmouseout', 'onkeypress', 'onkeydown', 'onkeyup',
+    'onfocus', 'onblur', 'onchange')
+
+
+def _attributes(static, *dynamic):
+    """Return the attributes of an element in the order they are rendered.
+
+    ``static`` are the attributes written in the template, either strings
+    rendered as they are or pairs of the attribute name and the name of the
+    widget attribute providing the value. They are followed by the
+    ``dynamic`` attributes only set by ``tal:attributes``, which page
+    templates add sorted by name.
+    """
+    return tuple(static) + tuple((name, name) for name in sorted(dynamic))
+
+
+_TEXT_INPUT = _attributes(
+    (('id', 'id'), ('name', 'name'), ('class', 'klass'), ('title', 'title'),
+     ('lang', 'lang'), ('disabled', 'disabled'), ('readonly', 'readonly'),
+     ('alt', 'alt'), ('tabindex', 'tabindex'), ('accesskey', 'accesskey'),
+     ('size', 'size'), ('maxlength', 'maxlength'), ('style', 'style'),
+     ('value', 'value'), ' type="text"'),
+    'onselect', 'placeholder', 'autocapitalize', *_EVENTS)
+
+_TEXT_DISPLAY = _attributes(
+    (('id', 'id'), ('class', 'klass')),
+    'style', 'title', 'lang', *_EVENTS[:10])
+
+_PASSWORD_INPUT = _attributes(
+    (('id', 'id'), ('name', 'name'), ('class', 'klass'), ('title', 'title'),
+     ('lang', 'lang'), ('disabled', 'disabled'), ('readonly', 'readonly'),
+     ('alt', 'alt'), ('tabindex', 'tabindex'), ('accesskey', 'accesskey'),
+     ('size', 'size'), ('maxlength', 'maxlength'), ' type="password"'),
+    'style', 'onselect', 'placeholder', 'autocapitalize', *_EVENTS)
+
+_FILE_INPUT = _attributes(
+    (' type="file"', ('id', 'id'), ('name', 'name'), ('class', 'klass'),
+     ('title', 'title'), ('lang', 'lang'), ('disabled', 'disabled'),
+     ('readonly', 'readonly'), ('alt', 'alt'), ('tabindex', 'tabindex'),
+     ('accesskey', 'accesskey'), ('size', 'size'),
+     ('maxlength', 'maxlength')),
+    'style', 'onselect', *_EVENTS)
+
+_TEXTAREA_INPUT = _attributes(
+    (('id', 'id'), ('name', 'name'), ('class', 'klass'), ('cols', 'cols'),
+     ('rows', 'rows'), ('tabindex', 'tabindex'), ('disabled', 'disabled'),
+     ('readonly', 'readonly'), ('accesskey', 'accesskey')),
+    'style', 'title', 'lang', 'onselect', *_EVENTS)
+
+_SUBMIT_INPUT = _attributes(
+    (('id', 'id'), ('name', 'name'), ('class', 'klass'), ('value', 'value'),
+     ('accesskey', 'accesskey'), ' type="submit"'),
+    'style', 'lang', 'disabled', 'tabindex', 'readonly', 'alt', 'onselect',
+    *_EVENTS)
+
+# The ``name`` attribute of the select element is rendered separately.
+_SELECT_INPUT = _attributes(
+    (('class', 'klass'), ('tabindex', 'tabindex'), ('disabled', 'disabled'),
+     ('multiple', 'multiple'), ('size', 'size')),
+    'style', 'title', 'lang', *_EVENTS)
+
+# Checkboxes and radio buttons get their ``id``, ``name`` and ``value`` from
+# the item, the other attributes are taken from the widget.
+_OPTION_INPUT = (
+    ('class', 'klass'), ('alt', 'alt'), ('title', 'title'),
+    ('tabindex', 'tabindex'), ('disabled', 'disabled'),
+    ('readonly', 'readonly'), ('accesskey', 'accesskey'),
+)
+_OPTION_INPUT_EXTRA = _attributes((), 'style', 'lang', 'onselect', *_EVENTS)
+
+
+def _text(value, request):
+    if isinstance(value, Message):
+        value = translate(value, context=request)
+    return (str(value).replace('&', '&amp;').replace('<', '&lt;')
+            .replace('>', '&gt;'))
+
+
+def _writeAttribute(write, name, value, request):
+    if name in BOOLEAN_HTML_ATTRIBUTES:
+        if value:
+            write(f' {name}="{name}"')
+        return
+    if value is None:
+        return
+    if isinstance(value, Message):
+        value = translate(value, context=request)
+    write(f' {name}="{escapeAttribute(str(value))}"')
+
+
+def _writeAttributes(write, widget, attributes):
+    request = widget.request
+    for attribute in attributes:
+        if attribute.__class__ is str:
+            write(attribute)
+        else:
+            name, attr = attribute
+            _writeAttribute(
+                write, name, getattr(widget, attr, None), request)
+
+
+def _writeEmptyMarker(write, widget):
+    write('\n<input')
+    _writeAttribute(
+        write, 'name', f'{widget.name}-empty-marker', widget.request)
+    write(' type="hidden" value="1" />\n\n')
+
+
+def _renderTextInput(widget, write):
+    write('\n    <input')
+    _writeAttributes(write, widget, _TEXT_INPUT)
+    write(' />\n\n')
+
+
+def _renderTextDisplay(widget, write):
+    write('\n    <span')
+    _writeAttributes(write, widget, _TEXT_DISPLAY)
+    write('>')
+    value = widget.value
+    if value:
+        write(_text(value, widget.request))
+    write('</span>\n\n')
+
+
+def _renderPasswordInput(widget, write):
+    write('\n<input')
+    _writeAttributes(write, widget, _PASSWORD_INPUT)
+    write(' />\n\n')
+
+
+def _renderFileInput(widget, write):
+    write('\n<input')
+    _writeAttributes(write, widget, _FILE_INPUT)
+    write(' />\n\n')
+
+
+def _renderTextAreaInput(widget, write):
+    write('\n<textarea')
+    _writeAttributes(write, widget, _TEXTAREA_INPUT)
+    write('>')
+    value = widget.value
+    if value is not None:
+        write(_text(value, widget.request))
+    write('</textarea>\n\n')
+
+
+def _renderSubmitInput(widget, write):
+    write('\n<input')
+    _writeAttributes(write, widget, _SUBMIT_INPUT)
+    write(' />\n\n')
+
+
+def _renderSelectInput(widget, write):
+    request = widget.request
+    write('\n<select')
+    _writeAttribute(write, 'id', widget.id, request)
+    _writeAttribute(write, 'name', f'{widget.name}:list', request)
+    _writeAttributes(write, widget, _SELECT_INPUT)
+    write('>')
+    for item in widget.items:
+        write('\n<option')
+        _writeAttribute(write, 'id', item['id'], request)
+        _writeAttribute(write, 'value', item['value'], request)
+        if item['selected']:
+            write(' selected="selected"')
+        write('>')
+        content = item['content']
+        if content is not None:
+            write(_text(content, request))
+        write('</option>')
+    write('\n</select>')
+    _writeEmptyMarker(write, widget)
+
+
+def _writeCheckBox(write, widget, item):
+    request = widget.request
+    checked = item['checked']
+    write('<input')
+    if checked:
+        write(' type="checkbox"')
+    _writeAttribute(write, 'id', item['id'], request)
+    _writeAttribute(write, 'name', item['name'], request)
+    _writeAttributes(write, widget, _OPTION_INPUT)
+    _writeAttribute(write, 'value', item['value'], request)
+    if checked:
+        write(' checked="checked"')
+    else:
+        write(' type="checkbox"')
+    _writeAttributes(write, widget, _OPTION_INPUT_EXTRA)
+    write(' />')
+
+
+def _renderCheckBoxInput(widget, write):
+    request = widget.request
+    items = list(widget.items)
+    single = len(items) == 1
+    write('\n')
+    if items:
+        if not single:
+            write('<span')
+            _writeAttribute(write, 'id', widget.id, request)
+            write('>')
+        for item in items:
+            write('\n <span class="option"')
+            if single:
+                _writeAttribute(write, 'id', widget.id, request)
+            write('>\n  ')
+            _writeCheckBox(write, widget, item)
+            write('\n  <label')
+            _writeAttribute(write, 'for', item['id'], request)
+            write('>\n    <span class="label">')
+            if item['label'] is not None:
+                write(_text(item['label'], request))
+            write('</span>\n  </label>\n </span>')
+        write('\n')
+        if not single:
+            write('</span>')
+    _writeEmptyMarker(write, widget)
+
+
+def _renderRadioInput(widget, write):
+    request = widget.request
+    for item in widget.items:
+        write('\n<span class="option">\n  <label')
+        _writeAttribute(write, 'for', item['id'], request)
+        write('>\n    \n  <input')
+        # The attributes of ``radio_input_single.pt``.
+        _writeAttribute(write, 'id', item['id'], request)
+        _writeAttribute(write, 'name', item['name'], request)
+        _writeAttributes(write, widget, _OPTION_INPUT)
+        _writeAttribute(write, 'value', item['value'], request)
+        if item['checked']:
+            write(' checked="checked"')
+        write(' type="radio"')
+        _writeAttributes(write, widget, _OPTION_INPUT_EXTRA)
+        write(' />\n\n\n    <span class="label">')
+        if item['label'] is not None:
+            write(_text(item['label'], request))
+        write('</span>\n  </label>\n</span>')
+    _writeEmptyMarker(write, widget)
+
+
+def _path(filename):
+    return os.path.join(os.path.dirname(__file__), filename)
+
+
+_normpath = functools.lru_cache(maxsize=256)(os.path.normpath)
+
+# Renderers for the shipped templates by their file names.
+_renderers = {
+    _normpath(_path(filename)): renderer
+    for filename, renderer in (
+        ('text_input.pt', _renderTextInput),
+        ('text_display.pt', _renderTextDisplay),
+        ('password_input.pt', _renderPasswordInput),
+        ('file_input.pt', _renderFileInput),
+        ('textarea_input.pt', _renderTextAreaInput),
+        ('submit_input.pt', _renderSubmitInput),
+        ('select_input.pt', _renderSelectInput),
+        ('checkbox_input.pt', _renderCheckBoxInput),
+        ('radio_input.pt', _renderRadioInput),
+    )
+}
+_layoutPath = _normpath(_path('widget_layout.pt'))
+_radioSinglePath = _normpath(_path('radio_input_single.pt'))
+
+
+def _getFileName(template):
+    filename = getattr(template, 'filename', None)
+    if filename is None:
+        return None
+    return _normpath(filename)
+
+
+def _hasStandardRendering(widget):
+    klass = type(widget)
+    # Cached display widgets are rendered by ``render()`` to use the cache.
+    return (klass.render is Widget.render and
+            klass.__call__ is Widget.__call__ and
+            widget.template is None and widget.layout is None and
+            not (widget.cacheDisplay and
+                 widget.mode == interfaces.DISPLAY_MODE))
+
+
+def _getRenderer(widget, template):
+    renderer = _renderers.get(_getFileName(template))
+    if renderer is _renderRadioInput:
+        # The radio widget renders its buttons by another template.
+        if type(widget).renderForValue is not RadioWidget.renderForValue:
+            return None
+        try:
+            single = getWidgetTemplate(
+                widget, IPageTemplate, widget.mode + '_single')
+        except zope.interface.interfaces.ComponentLookupError:
+            return None
+        if _getFileName(single) != _radioSinglePath:
+            return None
+    return renderer
+
+
+def renderPlainWidget(widget, write):
+    """Write the widget without its layout, like ``widget.render()``."""
+    if not _hasStandardRendering(widget):
+        write(widget.render())
+        return
+    template = getWidgetTemplate(widget, IPageTemplate, widget.mode)
+    renderer = _getRenderer(widget, template)
+    if renderer is None:
+        write(template(widget))
+    else:
+        renderer(widget, write)
+
+
+def renderWidget(widget, write):
+    """Write the widget with its layout, like ``widget()``."""
+    if not _hasStandardRendering(widget):
+        write(widget())
+        return
+    layout = getWidgetTemplate(
+        widget, interfaces.IWidgetLayoutTemplate, widget.mode)
+    if _getFileName(layout) != _layoutPath:
+        write(layout(widget))
+        return
+    request = widget.request
+    write('\n<div')
+    _writeAttribute(write, 'id', f'{widget.id}-row', request)
+    _writeAttribute(write, 'class', widget.getCSSClass('row'), request)
+    write('>\n  <div class="label">\n    <label')
+    _writeAttribute(write, 'for', widget.id, request)
+    write('>\n      <span>')
+    label = widget.label
+    if label is not None:
+        write(_text(
+            translate(label, context=request, default=label), request))
+    write('</span>\n      ')
+    if widget.required:
+        write('<span class="required">*</span>')
+    write('\n    </label>\n  </div>\n  <div class="widget">')
+    renderPlainWidget(widget, write)
+    write('</div>\n  ')
+    if widget.error:
+        write('<div class="error">\n    ')
+        write(widget.error.render())
+        write('\n  </div>')
+    write('\n</div>\n\n')
+
+
+def _render(widgets, renderer, write):
+    if write is not None:
+        for widget in widgets.values():
+            renderer(widget, write)
+        return None
+    chunks = []
+    write = chunks.append
+    for widget in widgets.values():
+        renderer(widget, write)
+    return ''.join(chunks)
+
+
+def renderWidgets(widgets, write=None):
+    """Render all widgets of a widget manager with their layout.
+
+    The output is passed to ``write`` if given, otherwise it is returned.
+    """
+    return _render(widgets, renderWidget, write)
+
+
+def renderActions(actions, write=None):
+    """Render all actions of an action manager.
+
+    The output is passed to ``write`` if given, otherwise it is returned.
+    """
+    return _render(actions, renderPlainWidget, write)
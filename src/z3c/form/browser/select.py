@@ -20,9 +20,9 @@ import zope.component
 import zope.interface
 import zope.schema
 import zope.schema.interfaces
-from zope.i18n import translate
 
 from z3c.form import interfaces
+from z3c.form import util
 from z3c.form.browser import widget
 from z3c.form.i18n import MessageFactory as _
 from z3c.form.widget import FieldWidget
@@ -77,13 +77,12 @@ class SelectWidget(widget.HTMLSelectWidget, SequenceWidget):
             id = '%s-%s%i' % (self.id, prefix, idx)
             content = term.token
             if zope.schema.interfaces.ITitledTokenizedTerm.providedBy(term):
-                content = translate(
-                    term.title, context=self.request, default=term.title)
+                content = util.translateTitle(term.title, self.request)
             items.append(
                 {'id': id, 'value': term.token, 'content': content,
                  'selected': selected})
 
-        for idx, term in enumerate(self.terms):
+        for idx, term in enumerate(self.getVisibleTerms()):
             addItem(idx, term)
 
         if ignored:
@@ -101,7 +100,7 @@ class SelectWidget(widget.HTMLSelectWidget, SequenceWidget):
 
     def json_data(self):
         data = super().json_data()
-        data['options'] = self.items
+        self.addJSONOptions(data)
         data['type'] = 'select'
         return data
 
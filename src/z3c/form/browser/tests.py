@@ -83,6 +83,10 @@ def test_suite():
                      setUp=setUp, tearDown=testing.tearDown,
                      optionflags=flags, checker=testing.outputChecker,
                      ),
+        DocFileSuite('renderer.rst',
+                     setUp=setUp, tearDown=testing.tearDown,
+                     optionflags=flags, checker=testing.outputChecker,
+                     ),
         DocFileSuite('select-missing-terms.rst',
                      setUp=setUp, tearDown=testing.tearDown,
                      optionflags=flags, checker=testing.outputChecker,
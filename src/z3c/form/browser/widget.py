@@ -13,12 +13,17 @@
 ##############################################################################
 """Widget Framework Implementation."""
 __docformat__ = "reStructuredText"
+import functools
+
 import zope.interface
+from zope.i18n import translate
+from zope.i18nmessageid import Message
 from zope.schema.fieldproperty import FieldProperty
 
 from z3c.form.browser import interfaces
 from z3c.form.interfaces import INPUT_MODE
 from z3c.form.interfaces import IFieldWidget
+from z3c.form.widget import setWidgetAttributes
 
 
 class WidgetLayoutSupport:
@@ -79,13 +84,22 @@ class WidgetLayoutSupport:
         required rendering.
 
         """
-        classes = []
         # setup class names
         if klass is not None:
             kls = klass
         else:
             kls = self.css
 
+        if type(self).wrapCSSClass is WidgetLayoutSupport.wrapCSSClass:
+            # The result only depends on the arguments and the error and
+            # required state, so it can be cached.
+            return _getCSSClass(
+                kls, error, required, self.error is not None,
+                bool(self.required), classPattern, errorPattern,
+                requiredPattern)
+
+        classes = []
+
         # setup error class names
         if error is not None:
             error = error
@@ -107,14 +121,40 @@ class WidgetLayoutSupport:
         # append given class names
         classes += self.wrapCSSClass(kls, classPattern)
         # remove duplicated class names but keep order
-        unique = []
-        [unique.append(kls) for kls in classes if kls not in unique]
-        return ' '.join(unique)
+        return ' '.join(dict.fromkeys(classes))
+
+
+def _wrapCSSClass(klass, pattern):
+    if klass is not None and pattern is not None:
+        return [pattern % {'class': k} for k in klass.split()]
+    return []
+
+
+@functools.lru_cache(maxsize=1024)
+def _getCSSClass(klass, error, required, hasError, isRequired,
+                 classPattern, errorPattern, requiredPattern):
+    """Compute the CSS classes of ``WidgetLayoutSupport.getCSSClass``."""
+    if error is None:
+        error = klass
+    if required is None:
+        required = klass
+    classes = []
+    if hasError:
+        classes += _wrapCSSClass(error, errorPattern)
+    if isRequired:
+        classes += _wrapCSSClass(required, requiredPattern)
+    classes += _wrapCSSClass(klass, classPattern)
+    # remove duplicated class names but keep order
+    return ' '.join(dict.fromkeys(classes))
 
 
 @zope.interface.implementer(interfaces.IHTMLFormElement)
 class HTMLFormElement(WidgetLayoutSupport):
 
+    # Share the specifications of widgets with the same interfaces, see
+    # ``z3c.form.util.alsoProvides()``.
+    declaresInterfacesByClass = True
+
     id = FieldProperty(interfaces.IHTMLFormElement['id'])
     klass = FieldProperty(interfaces.IHTMLFormElement['klass'])
     style = FieldProperty(interfaces.IHTMLFormElement['style'])
@@ -142,19 +182,35 @@ class HTMLFormElement(WidgetLayoutSupport):
     # layout support
     css = FieldProperty(interfaces.IHTMLFormElement['css'])
 
+    # The unique class names of ``klass`` in their order together with the
+    # ``klass`` value they were computed for. A tuple is kept rather than a
+    # set, since widgets have only a few classes.
+    _classList = None
+
     def addClass(self, klass: str):
         """Add a class to the HTML element.
 
         See interfaces.IHTMLFormElement.
         """
         if not self.klass:
-            self.klass = str(klass)
+            setWidgetAttributes(self, klass=str(klass))
+            return
+        current = self.klass
+        if self._classList is not None and self._classList[0] is current:
+            names = self._classList[1]
+            changed = False
         else:
-            # make sure items are not repeated
-            parts = self.klass.split() + klass.split()
-            # Remove duplicates and keep order.
-            parts = list(dict.fromkeys(parts))
-            self.klass = " ".join(parts)
+            # ``klass`` was set directly, start from its (unique) names.
+            names = tuple(dict.fromkeys(current.split()))
+            changed = True
+        added = tuple(name for name in dict.fromkeys(klass.split())
+                      if name not in names)
+        if added:
+            names += added
+            changed = True
+        if changed:
+            setWidgetAttributes(self, klass=" ".join(names))
+        self._classList = (self.klass, names)
 
     def update(self):
         """See z3c.form.interfaces.IWidget"""
@@ -192,6 +248,21 @@ class HTMLFormElement(WidgetLayoutSupport):
 
     _attributes = None
 
+    @classmethod
+    def _getHTMLAttributeNames(cls, inst) -> tuple:
+        """Return the HTML attribute names and their output names.
+
+        The ``_html_attributes`` of a class do not depend on the instance, so
+        they are computed only once per class.
+        """
+        names = cls.__dict__.get('_html_attribute_names')
+        if names is None:
+            names = tuple(
+                (attr, "class" if attr == "klass" else attr)
+                for attr in inst._html_attributes)
+            cls._html_attribute_names = names
+        return names
+
     @property
     def attributes(self) -> dict:
         # If `attributes` were explicitly set, return them.
@@ -199,11 +270,12 @@ class HTMLFormElement(WidgetLayoutSupport):
             return self._attributes
 
         # Otherwise return the default set of non-empty HTML attributes.
-        attributes_items = [
-            ("class" if attr == "klass" else attr, getattr(self, attr, None))
-            for attr in self._html_attributes
-        ]
-        self._attributes = {key: val for key, val in attributes_items if val}
+        attributes = {}
+        for attr, key in self._getHTMLAttributeNames(self):
+            val = getattr(self, attr, None)
+            if val:
+                attributes[key] = val
+        self._attributes = attributes
         return self._attributes
 
     @attributes.setter
@@ -211,6 +283,27 @@ class HTMLFormElement(WidgetLayoutSupport):
         # Store the explicitly set attributes.
         self._attributes = value
 
+    def getFragmentCacheKey(self, template):
+        """See z3c.form.widget.Widget"""
+        attributes = tuple(
+            getattr(self, attr, None)
+            for attr, name in self._getHTMLAttributeNames(self))
+        return super().getFragmentCacheKey(template) + attributes
+
+    def renderAttributes(self, out=None):
+        """Render the HTML attributes of the element.
+
+        See interfaces.IHTMLFormElement.
+        """
+        if out is not None:
+            writeAttributes(
+                out.write, self.attributes, getattr(self, 'request', None))
+            return None
+        chunks = []
+        writeAttributes(
+            chunks.append, self.attributes, getattr(self, 'request', None))
+        return ''.join(chunks)
+
 
 @zope.interface.implementer(interfaces.IHTMLInputWidget)
 class HTMLInputWidget(HTMLFormElement):
@@ -291,11 +384,37 @@ class HTMLSelectWidget(HTMLFormElement):
         return attributes
 
 
+def escapeAttribute(value):
+    """Escape an attribute value like page templates do."""
+    return (value.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('>', '&gt;').replace('"', '&quot;'))
+
+
+def writeAttributes(write, attributes, request=None):
+    """Write HTML attributes.
+
+    Each attribute is passed to ``write`` as `` name="value"``, with the
+    value escaped. Attributes with a value of ``None`` are skipped and
+    message ids are translated.
+    """
+    for name, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, Message):
+            value = translate(value, context=request)
+        write(f' {name}="{escapeAttribute(str(value))}"')
+
+
 def addFieldClass(widget):
     """Add a class to the widget that is based on the field type name.
 
     If the widget does not have field, then nothing is done.
     """
     if IFieldWidget.providedBy(widget):
-        klass = str(widget.field.__class__.__name__.lower() + '-field')
-        widget.addClass(klass)
+        widget.addClass(getFieldClass(widget.field.__class__))
+
+
+@functools.lru_cache(maxsize=1000)
+def getFieldClass(fieldClass):
+    # The names are shared by all widgets of a field type.
+    return str(fieldClass.__name__.lower() + '-field')
@@ -245,6 +245,26 @@ class ButtonActions(action.Actions):
         zope.interface.Interface,
         zope.interface.Interface)
 
+    def __init__(self, form, request, content):
+        super().__init__(form, request, content)
+        self._titleValues = {}
+
+    def _getTitleValue(self, name, button):
+        # The discriminators of the title value do not change for the
+        # lifetime of the manager, so the adapter is only looked up again if
+        # the button or the registry changed. Computed values are still
+        # evaluated on every update.
+        generation = util.getAdapterRegistryGeneration()
+        cached = self._titleValues.get(name)
+        if (cached is None or cached[0] is not button or
+                cached[1] != generation):
+            cached = self._titleValues[name] = (
+                button, generation,
+                zope.component.queryMultiAdapter(
+                    (self.form, self.request, self.content, button, self),
+                    interfaces.IValue, name='title'))
+        return cached[2]
+
     def update(self):
         """See z3c.form.interfaces.IActions."""
         # Create a unique prefix.
@@ -276,9 +296,7 @@ class ButtonActions(action.Actions):
             # Step 3: Set the name on the button
             buttonAction.name = prefix + name
             # Step 4: Set any custom attribute values.
-            title = zope.component.queryMultiAdapter(
-                (self.form, self.request, self.content, button, self),
-                interfaces.IValue, name='title')
+            title = self._getTitleValue(name, button)
             if title is not None:
                 buttonAction.title = title.get()
             # Step 5: Set the form
@@ -4,6 +4,7 @@ import zope.location
 from zope.contentprovider.interfaces import IContentProvider
 
 from z3c.form import interfaces
+from z3c.form import util
 from z3c.form.error import MultipleErrors
 from z3c.form.field import FieldWidgets
 from z3c.form.interfaces import IContentProviders
@@ -57,7 +58,7 @@ class FieldWidgetsAndProviders(FieldWidgets):
 
     def update(self):
         super().update()
-        uniqueOrderedKeys = list(self.keys())
+        insertions = []
         d = {}
         d.update(self)
         for name in self.form.contentProviders:
@@ -70,10 +71,11 @@ class FieldWidgetsAndProviders(FieldWidgets):
             contentProvider = factory(self)
             shortName = name
             contentProvider.update()
-            uniqueOrderedKeys.insert(factory.position, shortName)
+            insertions.append((factory.position, shortName))
             d[shortName] = contentProvider
             zope.location.locate(contentProvider, self, shortName)
-        self.create_according_to_list(d, uniqueOrderedKeys)
+        self.create_according_to_list(
+            d, util.insertAtPositions(self.keys(), insertions))
 
     def extract(self):
         """See interfaces.IWidgets"""
@@ -17,6 +17,7 @@ import datetime
 import decimal
 
 import zope.component
+import zope.contenttype
 import zope.i18n.format
 import zope.interface
 import zope.publisher.browser
@@ -47,7 +48,7 @@ class BaseDataConverter:
         if interfaces.IFormAware.providedBy(self.widget):
             # form property required by objectwidget
             widget.form = self.widget.form
-            zope.interface.alsoProvides(widget, interfaces.IFormAware)
+            util.alsoProvides(widget, interfaces.IFormAware)
         converter = zope.component.getMultiAdapter(
             (field, widget), interfaces.IDataConverter)
         return converter
@@ -238,6 +239,58 @@ class TimedeltaDataConverter(FieldDataConverter):
         return datetime.timedelta(days, sum(seconds))
 
 
+@zope.interface.implementer(interfaces.IUploadedFile)
+class UploadedFile:
+    """An uploaded file, read on demand from the upload of the request."""
+
+    chunkSize = 1 << 16
+
+    def __init__(self, upload):
+        self.upload = upload
+        self.filename = upload.filename
+        self.headers = upload.headers
+
+    @property
+    def contentType(self):
+        """See interfaces.IUploadedFile"""
+        contentType = (self.headers or {}).get('Content-Type')
+        if contentType:
+            return contentType
+        return zope.contenttype.guess_content_type(self.filename or '')[0]
+
+    @property
+    def size(self):
+        """See interfaces.IUploadedFile"""
+        return util.getFileSize(self.upload)
+
+    def __len__(self):
+        return self.size
+
+    def read(self, size=-1):
+        """See interfaces.IUploadedFile"""
+        return self.upload.read(size)
+
+    def seek(self, offset, whence=0):
+        """See interfaces.IUploadedFile"""
+        return self.upload.seek(offset, whence)
+
+    def tell(self):
+        """See interfaces.IUploadedFile"""
+        return self.upload.tell()
+
+    def __iter__(self):
+        """See interfaces.IUploadedFile"""
+        self.upload.seek(0)
+        while True:
+            chunk = self.upload.read(self.chunkSize)
+            if not chunk:
+                break
+            yield chunk
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.filename!r}>'
+
+
 class FileUploadDataConverter(BaseDataConverter):
     """A special data converter for bytes, supporting also FileUpload.
 
@@ -272,6 +325,17 @@ class FileUploadDataConverter(BaseDataConverter):
             except AttributeError as e:
                 raise ValueError(_('Bytes data are not a file object'), e)
             else:
+                # Reject unacceptable files before reading them.
+                checkUpload = getattr(self.widget, 'checkUpload', None)
+                if checkUpload is not None:
+                    checkUpload(value)
+                if getattr(self.widget, 'streamed', False):
+                    # Leave the data in the upload, it is read when the
+                    # value gets stored.
+                    uploaded = UploadedFile(value)
+                    if uploaded.size or getattr(value, 'filename', ''):
+                        return uploaded
+                    return self.field.missing_value
                 seek(0)
                 data = read()
                 if data or getattr(value, 'filename', ''):
@@ -326,17 +390,10 @@ class CollectionSequenceDataConverter(BaseDataConverter):
         widget = self.widget
         if widget.terms is None:
             widget.updateTerms()
-        values = []
-        for entry in value:
-            term = None
-            try:
-                term = widget.terms.getTerm(entry)
-            except LookupError:
-                # Swallow lookup errors, in case the options changed.
-                pass
-            if term is not None:
-                values.append(term.token)
-        return values
+        terms = util.getTermsByValues(widget.terms, value)
+        # Swallow missing terms, in case the options changed.
+        terms = [util.queryTermByKey(terms, entry) for entry in value]
+        return [term.token for term in terms if term is not None]
 
     def toFieldValue(self, value):
         """See interfaces.IDataConverter"""
@@ -346,8 +403,11 @@ class CollectionSequenceDataConverter(BaseDataConverter):
         collectionType = self.field._type
         if isinstance(collectionType, tuple):
             collectionType = collectionType[-1]
-        return collectionType([widget.terms.getValue(token)
-                              for token in value])
+        terms = util.getTermsByTokens(widget.terms, value)
+        for token in value:
+            if token not in terms:
+                raise LookupError(token)
+        return collectionType([terms[token].value for token in value])
 
 
 class TextLinesConverter(BaseDataConverter):
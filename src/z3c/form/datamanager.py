@@ -16,13 +16,20 @@
 import zope.component
 import zope.interface
 import zope.schema
+from zope.interface import providedBy
 from zope.interface.common import mapping
+from zope.security.checker import Checker
+from zope.security.checker import CheckerPublic
 from zope.security.checker import Proxy
 from zope.security.checker import canAccess
 from zope.security.checker import canWrite
 from zope.security.interfaces import ForbiddenAttribute
+from zope.security.management import queryInteraction
+from zope.security.proxy import getChecker
+from zope.security.proxy import removeSecurityProxy
 
 from z3c.form import interfaces
+from z3c.form import util
 
 
 _marker = []
@@ -35,6 +42,23 @@ except ModuleNotFoundError:
     pass
 
 
+def storeUploadedFile(obj, field, value):
+    """Return the value to store for a field of an object.
+
+    Uploaded files are stored by the ``IUploadedFileStorage`` adapter of the
+    object and the field. Without one, their data is read and stored as
+    bytes, which the upload has been validated as. Other values are returned
+    unchanged.
+    """
+    if not interfaces.IUploadedFile.providedBy(value):
+        return value
+    storage = zope.component.queryMultiAdapter(
+        (obj, field), interfaces.IUploadedFileStorage)
+    if storage is None:
+        return b''.join(value)
+    return storage.store(value)
+
+
 @zope.interface.implementer(interfaces.IDataManager)
 class DataManager:
     """Data manager base class."""
@@ -86,7 +110,9 @@ class AttributeField(DataManager):
                                self.context.__class__.__module__,
                                self.context.__class__.__name__))
         # get the right adapter or context
-        setattr(self.adapted_context, self.field.__name__, value)
+        context = self.adapted_context
+        value = storeUploadedFile(context, self.field, value)
+        setattr(context, self.field.__name__, value)
 
     def canAccess(self):
         """See z3c.form.interfaces.IDataManager"""
@@ -103,6 +129,85 @@ class AttributeField(DataManager):
         return True
 
 
+WRITE_PERMISSIONS_KEY = 'z3c.form.datamanager.writePermissions'
+
+
+def _getCheckedPermissions(request, checker, obj, interaction):
+    """Return the permission checks remembered for the request."""
+    principals = tuple(participation.principal.id
+                       for participation in interaction.participations
+                       if participation.principal is not None)
+    return util.getRequestData(
+        request, WRITE_PERMISSIONS_KEY, obj, checker, principals, interaction)
+
+
+def _canWriteAttributes(context, names, request):
+    """Return the names of the attributes, which can be written."""
+    if not isinstance(context, Proxy):
+        return set(names)
+    interaction = queryInteraction()
+    checker = getChecker(context)
+    # Only the permissions of checkers checking them like ``Checker`` can be
+    # introspected, e.g. not those of a ``CombinedChecker``.
+    if (interaction is None or
+            type(checker).check_setattr is not Checker.check_setattr):
+        return {name for name in names if canWrite(context, name)}
+    permissions = checker.set_permissions
+    readable = checker.get_permissions
+    obj = removeSecurityProxy(context)
+    checked = _getCheckedPermissions(request, checker, obj, interaction)
+    writable = set()
+    for name in names:
+        permission = permissions.get(name)
+        if permission is None:
+            # Attributes, which can only be read, are not writable, while
+            # ``canWrite()`` raises for completely forbidden ones.
+            allowed = name not in readable and canWrite(context, name)
+        elif permission is CheckerPublic:
+            allowed = True
+        else:
+            allowed = checked.get(permission)
+            if allowed is None:
+                allowed = checked[permission] = bool(
+                    interaction.checkPermission(permission, obj))
+        if allowed:
+            writable.add(name)
+    return writable
+
+
+def canWriteFields(context, fields, request=None):
+    """Return the names of the fields, which can be written on the context.
+
+    ``fields`` maps names to schema fields. The result is the same as asking
+    the data manager of each field, but the fields managed by
+    ``AttributeField`` are checked at once: the context is adapted once per
+    schema and the security checker of a proxied context is introspected, so
+    that each permission protecting the attributes is checked only once. If
+    a request is given, the checked permissions are remembered for the
+    request, per checker, object, principals and interaction.
+    """
+    writable = set()
+    bySchema = {}
+    adapters = zope.component.getSiteManager().adapters
+    for name, field in fields.items():
+        factory = adapters.lookup(
+            (providedBy(context), providedBy(field)), interfaces.IDataManager)
+        if factory is AttributeField:
+            bySchema.setdefault(field.interface, []).append((name, field))
+        elif zope.component.getMultiAdapter(
+                (context, field), interfaces.IDataManager).canWrite():
+            writable.add(name)
+    for schema, items in bySchema.items():
+        adapted = context
+        if schema is not None:
+            adapted = schema(context)
+        names = _canWriteAttributes(
+            adapted, [field.__name__ for name, field in items], request)
+        writable.update(name for name, field in items
+                        if field.__name__ in names)
+    return writable
+
+
 class DictionaryField(DataManager):
     """Dictionary field.
 
@@ -141,6 +246,7 @@ class DictionaryField(DataManager):
         if self.field.readonly:
             raise TypeError("Can't set values on read-only fields name=%s"
                             % self.field.__name__)
+        value = storeUploadedFile(self.data, self.field, value)
         self.data[self.field.__name__] = value
 
     def canAccess(self):
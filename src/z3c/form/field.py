@@ -16,21 +16,37 @@
 $Id$
 """
 __docformat__ = "reStructuredText"
+import copy
+
 import zope.component
 import zope.interface
 import zope.location
 import zope.schema.interfaces
+import zope.schema.vocabulary
 
+from z3c.form import datamanager
 from z3c.form import interfaces
 from z3c.form import util
 from z3c.form.error import MultipleErrors
 from z3c.form.widget import AfterWidgetUpdateEvent
+from z3c.form.widget import setWidgetAttributes
 
 
 def _initkw(keepReadOnly=(), omitReadOnly=False, **defaults):
     return keepReadOnly, omitReadOnly, defaults
 
 
+def _withVocabulary(field, vocabulary):
+    # A copy of a choice, or a collection of choices, with a named vocabulary,
+    # which uses the given vocabulary instead of looking it up when bound.
+    clone = copy.copy(field)
+    if zope.schema.interfaces.ICollection.providedBy(field):
+        clone.value_type = _withVocabulary(field.value_type, vocabulary)
+    else:
+        clone.vocabulary = vocabulary
+    return clone
+
+
 class WidgetFactories(dict):
 
     def __init__(self):
@@ -94,48 +110,54 @@ class Fields(util.SelectionManager):
     def __init__(self, *args, **kw):
         keepReadOnly, omitReadOnly, defaults = _initkw(**kw)
 
-        fields = []
+        super().__init__()
         for arg in args:
+            if self.managerInterface.providedBy(arg):
+                # The fields of another manager are wrapped and checked
+                # already, so they can be copied in one go.
+                self._extend(arg)
+                continue
+
             if isinstance(arg, zope.interface.interface.InterfaceClass):
-                for name, field in zope.schema.getFieldsInOrder(arg):
-                    fields.append((name, field, arg))
+                fields = [(name, field, arg)
+                          for name, field in zope.schema.getFieldsInOrder(arg)]
 
             elif zope.schema.interfaces.IField.providedBy(arg):
                 name = arg.__name__
                 if not name:
                     raise ValueError("Field has no name")
-                fields.append((name, arg, arg.interface))
-
-            elif self.managerInterface.providedBy(arg):
-                for form_field in arg.values():
-                    fields.append(
-                        (form_field.__name__, form_field,
-                         form_field.interface))
+                fields = [(name, arg, arg.interface)]
 
             elif isinstance(arg, Field):
-                fields.append((arg.__name__, arg, arg.interface))
+                fields = [(arg.__name__, arg, arg.interface)]
 
             else:
                 raise TypeError("Unrecognized argument type", arg)
 
-        super().__init__()
-        for name, field, iface in fields:
-            if isinstance(field, Field):
-                form_field = field
-            else:
-                if field.readonly:
-                    if omitReadOnly and (name not in keepReadOnly):
-                        continue
-                customDefaults = defaults.copy()
-                if iface is not None:
-                    customDefaults['interface'] = iface
-                form_field = Field(field, **customDefaults)
-                name = form_field.__name__
-
-            if name in self:
-                raise ValueError("Duplicate name", name)
-
-            self[name] = form_field
+            for name, field, iface in fields:
+                if isinstance(field, Field):
+                    form_field = field
+                else:
+                    if field.readonly:
+                        if omitReadOnly and (name not in keepReadOnly):
+                            continue
+                    customDefaults = defaults.copy()
+                    if iface is not None:
+                        customDefaults['interface'] = iface
+                    form_field = Field(field, **customDefaults)
+                    name = form_field.__name__
+
+                if name in self:
+                    raise ValueError("Duplicate name", name)
+
+                self[name] = form_field
+
+    def _extend(self, fields):
+        if self and not self.keys().isdisjoint(fields.keys()):
+            for name in fields.keys():
+                if name in self:
+                    raise ValueError("Duplicate name", name)
+        super().update(fields.items())
 
     def select(self, *names, **kwargs):
         """See interfaces.IFields"""
@@ -158,6 +180,7 @@ class Fields(util.SelectionManager):
         assert len(kwargs) == 0
         if prefix:
             names = [util.expandPrefix(prefix) + name for name in names]
+        names = set(names)
         return self.__class__(
             *[field for name, field in self.items()
               if not ((name in names and interface is None) or
@@ -182,6 +205,7 @@ class FieldWidgets(util.Manager):
     ignoreRequest = False
     ignoreReadonly = False
     ignoreRequiredOnExtract = False
+    prefetchVocabularies = False
     setErrors = True
 
     def __init__(self, form, request, content):
@@ -222,14 +246,40 @@ class FieldWidgets(util.Manager):
         # Create a unique prefix.
         prefix = util.expandPrefix(self.form.prefix)
         prefix += util.expandPrefix(self.prefix)
+        # Read the values of all fields using the context at once, if the
+        # content supports it.
+        values = None
+        checked = writable = ()
+        bulk = zope.component.queryAdapter(
+            self.content, interfaces.IBulkDataManager)
+        if bulk is not None:
+            contextFields = {
+                field.__name__: field.field
+                for field in self.form.fields.values()
+                if not self._ignoresContext(field)}
+            if contextFields:
+                values = bulk.query(contextFields)
+                checked = contextFields
+                writable = bulk.canWrite(contextFields)
+        else:
+            # Check the write permissions of all fields at once.
+            checked = {
+                field.__name__: field.field
+                for field in self.form.fields.values()
+                if self._checksWritable(field)}
+            if checked:
+                writable = datamanager.canWriteFields(
+                    self.content, checked, self.request)
+        # Resolve slow vocabularies concurrently, if desired.
+        boundFields = {}
+        if self.prefetchVocabularies:
+            boundFields = self._prefetchVocabularies()
         # Walk through each field, making a widget out of it.
         d = {}
         d.update(self)
         for field in self.form.fields.values():
             # Step 0. Determine whether the context should be ignored.
-            ignoreContext = self.ignoreContext
-            if field.ignoreContext is not None:
-                ignoreContext = field.ignoreContext
+            ignoreContext = self._ignoresContext(field)
             # Step 1: Determine the mode of the widget.
             mode = self.mode
             if field.mode is not None:
@@ -239,9 +289,13 @@ class FieldWidgets(util.Manager):
             elif not ignoreContext:
                 # If we do not have enough permissions to write to the
                 # attribute, then switch to display mode.
-                dm = zope.component.getMultiAdapter(
-                    (self.content, field.field), interfaces.IDataManager)
-                if not dm.canWrite():
+                if field.__name__ in checked:
+                    canWrite = field.__name__ in writable
+                else:
+                    dm = zope.component.getMultiAdapter(
+                        (self.content, field.field), interfaces.IDataManager)
+                    canWrite = dm.canWrite()
+                if not canWrite:
                     mode = interfaces.DISPLAY_MODE
             # Step 2: Get the widget for the given field.
             shortName = field.__name__
@@ -256,24 +310,30 @@ class FieldWidgets(util.Manager):
             else:
                 widget = zope.component.getMultiAdapter(
                     (field.field, self.request), interfaces.IFieldWidget)
-            # Step 3: Set the prefix for the widget
-            widget.name = prefix + shortName
-            widget.id = (prefix + shortName).replace('.', '-')
-            # Step 4: Set the context
-            widget.context = self.content
-            # Step 5: Set the form
-            widget.form = self.form
+            # Step 3-7: Set the prefix, the context, the form, some variables
+            # and the mode of the widget.
+            # Optimization: The values are computed here, so they are stored
+            # without validating them again.
+            name = prefix + shortName
+            setWidgetAttributes(
+                widget,
+                name=name,
+                id=name.replace('.', '-'),
+                context=self.content,
+                form=self.form,
+                ignoreContext=ignoreContext,
+                ignoreRequest=self.ignoreRequest,
+                mode=mode)
             # Optimization: Set both interfaces here, rather in step 4 and 5:
             # ``alsoProvides`` is quite slow
-            zope.interface.alsoProvides(
+            util.alsoProvides(
                 widget, interfaces.IContextAware, interfaces.IFormAware)
-            # Step 6: Set some variables
-            widget.ignoreContext = ignoreContext
-            widget.ignoreRequest = self.ignoreRequest
+            if values is not None and field.__name__ in values:
+                widget._prefetchedValue = (values[field.__name__],)
+            if field.__name__ in boundFields:
+                widget._prefetchedField = boundFields[field.__name__]
             if field.showDefault is not None:
                 widget.showDefault = field.showDefault
-            # Step 7: Set the mode of the widget
-            widget.mode = mode
             # Step 8: Update the widget
             widget.update()
             zope.event.notify(AfterWidgetUpdateEvent(widget))
@@ -285,6 +345,37 @@ class FieldWidgets(util.Manager):
                 zope.location.locate(widget, self, shortName)
         self.create_according_to_list(d, self.form.fields.keys())
 
+    def _prefetchVocabularies(self):
+        # Create each named vocabulary once, in the worker threads. Context
+        # source binders are left to the widgets, since they usually use the
+        # content, which must not be used from other threads if persistent.
+        fields = {}
+        for field in self.form.fields.values():
+            name = util.getVocabularyName(field.field)
+            if name is not None:
+                fields.setdefault(name, []).append(field)
+        registry = zope.schema.vocabulary.getVocabularyRegistry()
+        names = list(fields)
+        vocabularies = util.mapConcurrently(
+            lambda name: registry.get(self.content, name), names)
+        boundFields = {}
+        for name, vocabulary in zip(names, vocabularies):
+            for field in fields[name]:
+                boundFields[field.__name__] = _withVocabulary(
+                    field.field, vocabulary).bind(self.content)
+        return boundFields
+
+    def _checksWritable(self, field):
+        # Whether the mode of the widget depends on the write permission.
+        return (field.mode is None and
+                not (field.field.readonly and not self.ignoreReadonly) and
+                not self._ignoresContext(field))
+
+    def _ignoresContext(self, field):
+        if field.ignoreContext is not None:
+            return field.ignoreContext
+        return self.ignoreContext
+
     def _extract(self, returnRaw=False):
         data = {}
         errors = ()
@@ -16,28 +16,48 @@
 $Id$
 """
 __docformat__ = "reStructuredText"
+import hashlib
 import json
+import os
+import re
 import sys
+import uuid
 
 import zope.component
+import zope.contenttype.parse
 import zope.event
 import zope.interface
 import zope.lifecycleevent
+import zope.schema.interfaces
 from zope.browserpage.viewpagetemplatefile import ViewPageTemplateFile
 from zope.pagetemplate.interfaces import IPageTemplate
 from zope.publisher import browser
+from zope.publisher.http import getCharsetUsingRequest
+from zope.publisher.interfaces.http import IResult
 from zope.schema.fieldproperty import FieldProperty
+from zope.security.proxy import removeSecurityProxy
 
 from z3c.form import button
 from z3c.form import field
 from z3c.form import interfaces
 from z3c.form import util
+from z3c.form.browser import renderer
 from z3c.form.events import DataExtractedEvent
 from z3c.form.i18n import MessageFactory as _
+from z3c.form.widget import getContextKey
+
+
+# Response status codes for which ``Form.__call__`` renders nothing.
+REDIRECT_STATUSES = (300, 301, 302, 303, 304, 305, 307)
 
 
 def applyChanges(form, content, data):
     changes = {}
+    # If the content has a bulk data manager, all changed values are set
+    # with one call.
+    bulk = zope.component.queryAdapter(content, interfaces.IBulkDataManager)
+    bulkFields = {}
+    bulkValues = {}
     for name, field_ in form.fields.items():
         # If the field is not in the data, then go on to the next one
         try:
@@ -48,27 +68,34 @@ def applyChanges(form, content, data):
         # sent a strong message not to do so.
         if newValue is interfaces.NOT_CHANGED:
             continue
-        if util.changedField(field_.field, newValue, context=content):
+        if bulk is not None:
+            bulkFields[name] = field_.field
+            bulkValues[name] = newValue
+        elif util.changedField(field_.field, newValue, context=content):
             # Only update the data, if it is different
             dm = zope.component.getMultiAdapter(
                 (content, field_.field), interfaces.IDataManager)
             dm.set(newValue)
             # Record the change using information required later
             changes.setdefault(dm.field.interface, []).append(name)
+    if bulkValues:
+        for name in util.setChangedValues(
+                content, bulk, bulkFields, bulkValues):
+            changes.setdefault(bulkFields[name].interface, []).append(name)
     return changes
 
 
 def extends(*args, **kwargs):
     frame = sys._getframe(1)
     f_locals = frame.f_locals
+    # Create the managers in one go, adding them up one by one would copy
+    # the fields and buttons collected so far for every argument.
     if not kwargs.get('ignoreFields', False):
-        f_locals['fields'] = field.Fields()
-        for arg in args:
-            f_locals['fields'] += getattr(arg, 'fields', field.Fields())
+        f_locals['fields'] = field.Fields(
+            *[getattr(arg, 'fields', field.Fields()) for arg in args])
     if not kwargs.get('ignoreButtons', False):
-        f_locals['buttons'] = button.Buttons()
-        for arg in args:
-            f_locals['buttons'] += getattr(arg, 'buttons', button.Buttons())
+        f_locals['buttons'] = button.Buttons(
+            *[getattr(arg, 'buttons', button.Buttons()) for arg in args])
     if not kwargs.get('ignoreHandlers', False):
         f_locals['handlers'] = button.Handlers()
         for arg in args:
@@ -103,6 +130,126 @@ def handleActionError(event):
         form.status = form.formErrorsMessage
 
 
+class _DeferredRendering:
+    """Stand-in for the template or layout of a widget.
+
+    It renders a marker, which is replaced by the HTML of the widget when
+    the chunks of the form are produced.
+    """
+
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __call__(self, widget):
+        return self.marker
+
+
+def _getStreamedWidgets(form):
+    """Yield all top-level widgets and actions of the form and its groups."""
+    for manager in (getattr(form, 'widgets', None),
+                    getattr(form, 'actions', None)):
+        if manager is not None:
+            yield from manager.values()
+    for group in getattr(form, 'groups', ()):
+        if not isinstance(group, type):
+            yield from _getStreamedWidgets(group)
+
+
+def _iterChunks(parts, widgets):
+    # ``parts`` alternates between the HTML of the form template and the
+    # markers of the widgets rendered in its place.
+    for index, part in enumerate(parts):
+        if index % 2 == 0:
+            if part:
+                yield part
+            continue
+        widget, withLayout = widgets[part]
+        chunks = []
+        if withLayout:
+            renderer.renderWidget(widget, chunks.append)
+        else:
+            renderer.renderPlainWidget(widget, chunks.append)
+        yield ''.join(chunks)
+
+
+def _matchesETag(header, etag):
+    # ``If-None-Match`` uses the weak comparison, see RFC 9110.
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate in ('*', opaque):
+            return True
+    return False
+
+
+# Keys of the JSON data of widgets which ``jsonChunks()`` leaves out if they
+# have these values.
+JSON_DEFAULTS = (('error', ''), ('label', ''), ('required', False))
+
+
+def _omitJSONDefaults(data, mode):
+    for key, default in JSON_DEFAULTS:
+        if key in data and data[key] == default:
+            del data[key]
+    if data.get('mode') == mode:
+        del data['mode']
+    for subData in data.get('widgets', ()):
+        _omitJSONDefaults(subData, mode)
+
+
+def _getSequenceWidgets(widgets):
+    for widget in widgets:
+        if interfaces.ISequenceWidget.providedBy(widget):
+            yield widget
+        elif interfaces.IMultiWidget.providedBy(widget):
+            yield from _getSequenceWidgets(widget.widgets)
+
+
+def _getWidgetJSONData(widget, optionsByReference):
+    changed = []
+    if optionsByReference:
+        for sequenceWidget in _getSequenceWidgets((widget,)):
+            if not sequenceWidget.optionsByReference:
+                sequenceWidget.optionsByReference = True
+                changed.append(sequenceWidget)
+    try:
+        return widget.json_data()
+    finally:
+        for sequenceWidget in changed:
+            sequenceWidget.optionsByReference = False
+
+
+@zope.interface.implementer(IResult)
+class FormResult:
+    """Response body producing the HTML of a form while it is iterated.
+
+    The chunks are encoded and joined to blocks of at least ``chunkSize``
+    bytes, which is what servers expect from a streamed response.
+    """
+
+    chunkSize = 1 << 16
+
+    def __init__(self, chunks, encoding='utf-8'):
+        self.chunks = chunks
+        self.encoding = encoding
+
+    def __iter__(self):
+        block = []
+        size = 0
+        for chunk in self.chunks:
+            chunk = chunk.encode(self.encoding)
+            block.append(chunk)
+            size += len(chunk)
+            if size >= self.chunkSize:
+                yield b''.join(block)
+                block = []
+                size = 0
+        if block:
+            yield b''.join(block)
+
+
 @zope.interface.implementer(interfaces.IForm,
                             interfaces.IFieldsForm)
 class BaseForm(browser.BrowserPage):
@@ -122,11 +269,98 @@ class BaseForm(browser.BrowserPage):
     ignoreRequest = False
     ignoreReadonly = False
     ignoreRequiredOnExtract = False
+    prefetchVocabularies = False
+    useETag = False
 
     def getContent(self):
         '''See interfaces.IForm'''
         return self.context
 
+    def getModificationMarker(self):
+        '''See interfaces.IForm'''
+        content = removeSecurityProxy(self.getContent())
+        if getattr(content, '_p_jar', None) is None:
+            # Not persistent, or new and without a serial of its own.
+            return None
+        if content._p_changed is None:
+            # Ghosts do not know their serial yet.
+            content._p_activate()
+        if content._p_changed:
+            # The changes are not committed yet.
+            return None
+        return content._p_serial
+
+    def getDefinitionToken(self):
+        '''See interfaces.IForm'''
+        klass = self.__class__
+        fields = []
+        for name, field_ in self.fields.items():
+            schemaField = field_.field
+            vocabulary = getattr(schemaField, 'vocabulary', None)
+            if zope.schema.interfaces.IIterableVocabulary.providedBy(
+                    vocabulary):
+                vocabulary = util.getTermsETag(vocabulary)
+            fields.append((
+                name, type(schemaField).__module__,
+                type(schemaField).__qualname__, schemaField.title,
+                schemaField.description, schemaField.required,
+                schemaField.readonly, field_.mode, field_.widgetFactory,
+                getattr(schemaField, 'vocabularyName', None), vocabulary))
+        buttons = tuple((name, button_.title)
+                        for name, button_ in getattr(
+                            self, 'buttons', {}).items())
+        template = self.template
+        if template is None:
+            template = zope.component.queryMultiAdapter(
+                (self, self.request), IPageTemplate)
+        filename = getattr(template, 'filename', None)
+        try:
+            modified = os.path.getmtime(filename)
+        except (OSError, TypeError):
+            modified = None
+        definition = repr((
+            klass.__module__, klass.__qualname__, fields, buttons,
+            self.label, self.prefix, self.mode, filename, modified))
+        return hashlib.md5(
+            definition.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+    def getETag(self):
+        '''See interfaces.IForm'''
+        marker = self.getModificationMarker()
+        if marker is None:
+            return None
+        request = self.request
+        languages = util.getPreferredLanguages(request)
+        # The principal stands in for the permissions of the user, which
+        # decide e.g. whether a field is shown in input or display mode.
+        principal = getattr(getattr(request, 'principal', None), 'id', None)
+        # Objects committed together share their serial.
+        content = getContextKey(self.getContent())
+        fingerprint = repr((
+            marker, content, request.getURL(), self.getDefinitionToken(),
+            languages, principal))
+        digest = hashlib.md5(
+            fingerprint.encode('utf-8'), usedforsecurity=False)
+        return 'W/"%s"' % digest.hexdigest()
+
+    def checkNotModified(self):
+        '''See interfaces.IForm'''
+        request = self.request
+        # Only plain requests for the form can be answered from the cache of
+        # the client, submitted data could change the result.
+        if (not self.useETag or request.method not in ('GET', 'HEAD')
+                or request.form):
+            return False
+        etag = self.getETag()
+        if etag is None:
+            return False
+        request.response.setHeader('ETag', etag)
+        ifNoneMatch = request.getHeader('If-None-Match')
+        if ifNoneMatch and _matchesETag(ifNoneMatch, etag):
+            request.response.setStatus(304)
+            return True
+        return False
+
     def updateWidgets(self, prefix=None):
         '''See interfaces.IForm'''
         self.widgets = zope.component.getMultiAdapter(
@@ -137,6 +371,7 @@ class BaseForm(browser.BrowserPage):
         self.widgets.ignoreContext = self.ignoreContext
         self.widgets.ignoreRequest = self.ignoreRequest
         self.widgets.ignoreReadonly = self.ignoreReadonly
+        self.widgets.prefetchVocabularies = self.prefetchVocabularies
         self.widgets.update()
 
     @property
@@ -167,6 +402,31 @@ class BaseForm(browser.BrowserPage):
             return template(self)
         return self.template()
 
+    def renderChunks(self):
+        '''See interfaces.IForm'''
+        # Render the form with a marker in place of every widget which does
+        # not have its own template or layout, so the template only produces
+        # the HTML around the widgets.
+        prefix = 'z3cformwidget%s' % uuid.uuid4().hex
+        widgets = {}
+        deferred = []
+        for index, widget in enumerate(_getStreamedWidgets(self)):
+            for name, withLayout in (('template', False), ('layout', True)):
+                if getattr(widget, name, False) is None:
+                    marker = '%s%dx%d' % (prefix, index, withLayout)
+                    widgets[marker] = (widget, withLayout)
+                    setattr(widget, name, _DeferredRendering(marker))
+                    deferred.append((widget, name))
+        try:
+            html = self.render()
+        finally:
+            for widget, name in deferred:
+                setattr(widget, name, None)
+        if not widgets:
+            return iter((html,) if html else ())
+        parts = re.split('(%s[0-9]+x[01])' % prefix, html)
+        return _iterChunks(parts, widgets)
+
     def json(self):
         data = {
             'errors': [
@@ -181,6 +441,27 @@ class BaseForm(browser.BrowserPage):
         }
         return json.dumps(data)
 
+    def jsonChunks(self, optionsByReference=False, omitDefaults=False):
+        '''See interfaces.IForm'''
+        # Produce the same document as ``json()``, but only hold the data
+        # of a single widget at a time.
+        encode = json.JSONEncoder().encode
+        errors = [
+            error.message for error in
+            (self.widgets.errors or []) if error.field is None
+        ]
+        yield '{"errors": %s, "prefix": %s, "status": %s, "mode": %s, ' \
+            '"fields": [' % (encode(errors), encode(self.prefix),
+                             encode(self.status), encode(self.mode))
+        separator = ''
+        for widget in self.widgets.values():
+            data = _getWidgetJSONData(widget, optionsByReference)
+            if omitDefaults:
+                _omitJSONDefaults(data, self.mode)
+            yield separator + encode(data)
+            separator = ', '
+        yield '], "label": %s}' % encode(self.label or '')
+
 
 @zope.interface.implementer(interfaces.IDisplayForm)
 class DisplayForm(BaseForm):
@@ -188,6 +469,12 @@ class DisplayForm(BaseForm):
     mode = interfaces.DISPLAY_MODE
     ignoreRequest = True
 
+    def __call__(self):
+        if self.checkNotModified():
+            return ''
+        self.update()
+        return self.render()
+
 
 @zope.interface.implementer(
     interfaces.IInputForm, interfaces.IButtonForm,
@@ -235,15 +522,46 @@ class Form(BaseForm):
             self.updateActions()
 
     def __call__(self):
+        if self.checkNotModified():
+            return ''
         self.update()
 
         # Don't render anything if we are doing a redirect
-        if self.request.response.getStatus() in (
-                300, 301, 302, 303, 304, 305, 307,):
+        if self.request.response.getStatus() in REDIRECT_STATUSES:
             return ''
 
         return self.render()
 
+    def stream(self):
+        """Update the form and return its HTML as a streamed response body.
+
+        Unlike ``__call__()`` the HTML of the widgets is only produced while
+        the publisher writes the response, so the objects accessed by them
+        must still be available at that time.
+        """
+        if self.checkNotModified():
+            return ''
+        self.update()
+
+        # Don't render anything if we are doing a redirect
+        response = self.request.response
+        if response.getStatus() in REDIRECT_STATUSES:
+            return ''
+        chunks = self.renderChunks()
+        if response.getStatus() in REDIRECT_STATUSES:
+            return ''
+
+        # Declare the encoding of the body like the publisher does for
+        # string results.
+        contentType = response.getHeader('content-type') or 'text/html'
+        major, minor, params = zope.contenttype.parse.parse(contentType)
+        encoding = params.setdefault(
+            'charset', getCharsetUsingRequest(self.request) or 'utf-8')
+        response.setHeader('content-type', ';'.join(
+            [f'{major}/{minor}'] +
+            [f'{key}={value}' for key, value in params.items()]))
+        return FormResult(chunks, encoding)
+
 
 @zope.interface.implementer(interfaces.IAddForm)
 class AddForm(Form):
@@ -41,7 +41,7 @@ class Group(form.BaseForm):
         self.widgets = zope.component.getMultiAdapter(
             (self, self.request, self.getContent()), interfaces.IWidgets)
         for attrName in ('mode', 'ignoreRequest', 'ignoreContext',
-                         'ignoreReadonly'):
+                         'ignoreReadonly', 'prefetchVocabularies'):
             value = getattr(self.parentForm.widgets, attrName)
             setattr(self.widgets, attrName, value)
         if prefix is not None:
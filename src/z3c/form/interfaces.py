@@ -284,6 +284,38 @@ class IDataManager(zope.interface.Interface):
         """Can the data manager write a value."""
 
 
+class IBulkDataManager(zope.interface.Interface):
+    """Data manager reading and writing the values of many fields at once.
+
+    The widget manager of a form looks up this adapter for its content. If
+    there is one, the values and write permissions of all fields are read
+    with one call each instead of one ``IDataManager`` call per field.
+    ``applyChanges()`` and the object converter write all changed values of
+    an object with one call.
+    """
+
+    def query(fields):
+        """Get the values of the given fields.
+
+        ``fields`` maps names, e.g. those of the form fields, to schema
+        fields. Return a mapping of these names to values; ``NO_VALUE`` marks
+        a missing value. Fields left out are read by their ``IDataManager``.
+        """
+
+    def canWrite(fields):
+        """Get the names of the given fields which can be written.
+
+        ``fields`` is the same as for ``query()``.
+        """
+
+    def set(fields, values):
+        """Set the values of the given fields.
+
+        ``fields`` is the same as for ``query()`` and ``values`` maps the
+        same names to the new values.
+        """
+
+
 # ----[ Data Converters ]----------------------------------------------------
 
 class IDataConverter(zope.interface.Interface):
@@ -345,6 +377,18 @@ class ITerms(zope.interface.Interface):
         LookupError is raised if there isn't a value in the source.
         """
 
+    def getTermsByTokens(tokens):
+        """Return a mapping of the given tokens to their terms.
+
+        Tokens which are not represented in the source are left out.
+        """
+
+    def getTermsByValues(values):
+        """Return a mapping of the given values to their terms.
+
+        Values which are not in the source are left out.
+        """
+
     def __iter__():
         """Iterate over terms."""
 
@@ -355,6 +399,25 @@ class ITerms(zope.interface.Interface):
         """Check wether terms containes the ``value``."""
 
 
+class IPagedTerms(ITerms):
+    """Terms of a large source, which can be read page by page.
+
+    Sequence widgets do not iterate over such terms, but only render the
+    selected terms and one page of the others.
+    """
+
+    def slice(offset, limit):
+        """Return at most ``limit`` terms, starting with the term at
+        ``offset``."""
+
+
+class ISearchableTerms(IPagedTerms):
+    """Paged terms, which can also be searched."""
+
+    def search(query, limit):
+        """Return at most ``limit`` terms matching the ``query`` string."""
+
+
 class IBoolTerms(ITerms):
     """A specialization that handles boolean choices."""
 
@@ -443,6 +506,13 @@ class IWidget(ILocation):
     template = zope.interface.Attribute('''The widget template''')
     layout = zope.interface.Attribute('''The widget layout template''')
 
+    cacheDisplay = zope.schema.Bool(
+        title=_('Cache Display'),
+        description=_('A flag, when set, caches the output of the widget in '
+                      'display mode until its context is modified.'),
+        default=False,
+        required=False)
+
     ignoreRequest = zope.schema.Bool(
         title=_('Ignore Request'),
         description=_('A flag, when set, forces the widget not to look at '
@@ -528,6 +598,36 @@ class ISequenceWidget(IWidget):
         description=_('A component that provides the options for selection.'),
         schema=ITerms)
 
+    optionsByReference = zope.schema.Bool(
+        title=_('Options by Reference'),
+        description=_('A flag, when set, makes the JSON data of the widget '
+                      'refer to the vocabulary instead of listing all '
+                      'options.'),
+        default=False,
+        required=False)
+
+    pageSize = zope.schema.Int(
+        title=_('Page Size'),
+        description=_('The number of unselected terms rendered, if the terms '
+                      'provide ``IPagedTerms``.'),
+        default=20,
+        min=0,
+        required=True)
+
+    pageStart = zope.schema.Int(
+        title=_('Page Start'),
+        description=_('The offset of the first unselected term rendered, if '
+                      'the terms provide ``IPagedTerms``.'),
+        default=0,
+        min=0,
+        required=True)
+
+    query = zope.schema.TextLine(
+        title=_('Query'),
+        description=_('A query selecting the unselected terms rendered, if '
+                      'the terms provide ``ISearchableTerms``.'),
+        required=False)
+
     def updateTerms():
         """Update the widget's ``terms`` attribute and return the terms.
 
@@ -535,6 +635,22 @@ class ISequenceWidget(IWidget):
         without having to worry whether they are already created or not.
         """
 
+    def getVisibleTerms():
+        """Return the terms to render.
+
+        These are all terms, unless the terms provide ``IPagedTerms``. Then
+        only the selected terms are returned, followed by one page of the
+        other terms or by the terms matching the ``query``.
+        """
+
+    def getOptionsReference():
+        """Get a reference to the vocabulary providing the options.
+
+        Returns a dictionary with the name of the vocabulary and an ETag of
+        its terms, or ``None`` if the vocabulary has no name. The ETag is
+        ``None`` for terms providing ``IPagedTerms``, which are not iterated.
+        """
+
 
 class IMultiWidget(IWidget):
     """None Term based sequence widget base.
@@ -628,6 +744,102 @@ class ITextWidget(IWidget):
 class IFileWidget(ITextWidget):
     """File widget."""
 
+    streamed = zope.schema.Bool(
+        title=_('Streamed'),
+        description=_('A flag, when set, converts uploaded files to '
+                      '``IUploadedFile`` objects instead of reading them '
+                      'into bytes.'),
+        default=False,
+        required=False)
+
+    maxSize = zope.schema.Int(
+        title=_('Maximum Size'),
+        description=_('The maximum size of uploaded files in bytes.'),
+        default=None,
+        required=False)
+
+    allowedContentTypes = zope.schema.Tuple(
+        title=_('Allowed Content Types'),
+        description=_('The content types of files which can be uploaded, '
+                      'e.g. ``image/png`` or ``image/*``. Any file can be '
+                      'uploaded if not set.'),
+        value_type=zope.schema.ASCIILine(),
+        default=None,
+        required=False)
+
+    sniffSize = zope.schema.Int(
+        title=_('Sniff Size'),
+        description=_('The number of bytes read from the start of uploaded '
+                      'files to recognize their content type.'),
+        default=4096,
+        required=True)
+
+    def checkUpload(upload):
+        """Check the size and content type of an uploaded file.
+
+        Only the first ``sniffSize`` bytes of the file are read. A
+        ``zope.schema.ValidationError`` is raised if the file is not
+        acceptable. If ``allowedContentTypes`` is set, the content type sent
+        with the file and the one recognized from its data must be allowed,
+        and at least one of them must be known. The data converter calls
+        this method before the file is read.
+        """
+
+
+class IUploadedFile(zope.interface.Interface):
+    """A file uploaded with a request, which is read on demand.
+
+    Iterating over the file yields its data in chunks, so that it can be
+    stored without keeping all of it in memory.
+    """
+
+    filename = zope.interface.Attribute('The name of the file.')
+
+    headers = zope.interface.Attribute('The headers of the upload.')
+
+    contentType = zope.interface.Attribute(
+        'The content type sent with the upload, or the one guessed from '
+        'the filename.')
+
+    size = zope.interface.Attribute(
+        'The size of the file in bytes, determined without reading it.')
+
+    def read(size=-1):
+        """Read and return up to ``size`` bytes, or all remaining bytes."""
+
+    def seek(offset, whence=0):
+        """Change the position in the file."""
+
+    def tell():
+        """Return the position in the file."""
+
+    def __iter__():
+        """Iterate over the data of the file in chunks of bytes."""
+
+
+class IUploadedFileStorage(zope.interface.Interface):
+    """Store uploaded files of a field without reading them into memory.
+
+    The data managers and the file upload validator look up a multi-adapter
+    of the object and the field to this interface for ``IUploadedFile``
+    values. Without one, the data of the file is read, validated and stored
+    as bytes.
+    """
+
+    def validate(upload):
+        """Validate the uploaded file instead of the field.
+
+        Raise a ``zope.schema.ValidationError`` if the file cannot be stored.
+        The size limits of the field are checked before.
+        """
+
+    def store(upload):
+        """Return the value to store for the uploaded file.
+
+        The file should be copied chunk by chunk, e.g. into a blob, or be
+        kept by its file handle.
+        """
+
 
 class IPasswordWidget(ITextWidget):
     """Password widget."""
@@ -689,6 +901,17 @@ class IWidgets(IManager):
         default=False,
         required=True)
 
+    prefetchVocabularies = zope.schema.Bool(
+        title=_('Prefetch Vocabularies'),
+        description=_(
+            'If set the named vocabularies of all fields are created '
+            'concurrently in worker threads, each of them once, before the '
+            'widgets are updated. Only set it if the vocabularies are safe '
+            'to create from several threads; e.g. they must not use '
+            'persistent objects, since ZODB connections are not thread-safe.'),
+        default=False,
+        required=True)
+
     hasRequiredFields = zope.schema.Bool(
         title=_('Has required fields'),
         description=_('A flag set when at least one field is marked as '
@@ -965,6 +1188,17 @@ class IForm(zope.interface.Interface):
         default=False,
         required=True)
 
+    prefetchVocabularies = zope.schema.Bool(
+        title=_('Prefetch Vocabularies'),
+        description=_(
+            'If set the named vocabularies of all fields are created '
+            'concurrently in worker threads, each of them once, before the '
+            'widgets are updated. Only set it if the vocabularies are safe '
+            'to create from several threads; e.g. they must not use '
+            'persistent objects, since ZODB connections are not thread-safe.'),
+        default=False,
+        required=True)
+
     widgets = zope.schema.Object(
         title=_('Widgets'),
         description=_('A widget manager containing the widgets to be used in '
@@ -994,9 +1228,52 @@ class IForm(zope.interface.Interface):
         default=None,
         required=False)
 
+    useETag = zope.schema.Bool(
+        title=_('Use ETag'),
+        description=_('A flag, when set, answers requests with a matching '
+                      'If-None-Match header with 304 without updating the '
+                      'form.'),
+        default=False,
+        required=False)
+
     def getContent():
         '''Return the content to be displayed and/or edited.'''
 
+    def getModificationMarker():
+        '''Return a value which changes whenever the content is modified.
+
+        ``None`` is returned if modifications cannot be detected. The default
+        implementation uses the serial of persistent content, which has no
+        changes, which are not committed yet.
+        '''
+
+    def getDefinitionToken():
+        '''Return a value which changes whenever the form definition changes.
+
+        The default implementation uses the class, label, prefix and mode of
+        the form, its buttons, the fields with their titles, descriptions,
+        modes, widget factories and vocabularies, as well as the file and
+        modification time of its template. Vocabularies looked up by name are
+        only represented by their name.
+        '''
+
+    def getETag():
+        '''Return the ETag of the form or ``None``.
+
+        The ETag is computed from the modification marker and the identity
+        of the content, the URL of the request, the definition token of the
+        form, the preferred languages and the principal of the request.
+        '''
+
+    def checkNotModified():
+        '''Check whether the client has the current version of the form.
+
+        If ``useETag`` is set, the ETag of the form is set on the response
+        of GET and HEAD requests without form data. If the ETag matches the
+        If-None-Match header of the request, the status of the response is
+        set to 304 and ``True`` is returned.
+        '''
+
     def updateWidgets(prefix=None):
         '''Update the widgets for the form.
 
@@ -1018,9 +1295,25 @@ class IForm(zope.interface.Interface):
     def render():
         '''Render the form.'''
 
+    def renderChunks():
+        '''Render the form as an iterator of HTML chunks.
+
+        The template of the form is rendered right away, the widgets are only
+        rendered while the chunks are iterated.
+        '''
+
     def json():
         '''Returns the form in json format'''
 
+    def jsonChunks(optionsByReference=False, omitDefaults=False):
+        '''Return the form in json format as an iterator of chunks.
+
+        The chunks joined are the same as the result of ``json()``. If
+        ``optionsByReference`` is set, sequence widgets refer to named
+        vocabularies instead of listing their options. If ``omitDefaults``
+        is set, widget keys having their default value are left out.
+        '''
+
 
 class ISubForm(IForm):
     """A subform."""
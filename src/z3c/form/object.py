@@ -84,7 +84,7 @@ class ObjectConverter(BaseDataConverter):
             if interfaces.IFormAware.providedBy(self.widget):
                 # form property required by objectwidget
                 widget.form = self.widget.form
-                zope.interface.alsoProvides(widget, interfaces.IFormAware)
+                util.alsoProvides(widget, interfaces.IFormAware)
             converter = zope.component.getMultiAdapter(
                 (field_, widget), interfaces.IDataConverter)
 
@@ -104,6 +104,11 @@ class ObjectConverter(BaseDataConverter):
         obj = self.widget.getObject(value)
         obj = self.adapted_obj(obj)
 
+        # If the object has a bulk data manager, all changed values are set
+        # with one call.
+        bulk = zope.component.queryAdapter(obj, interfaces.IBulkDataManager)
+        bulkFields = {}
+        bulkValues = {}
         names = []
         for name, field_ in zope.schema.getFieldsInOrder(self.field.schema):
             if not field_.readonly:
@@ -118,6 +123,10 @@ class ObjectConverter(BaseDataConverter):
                     (field_, widget), interfaces.IDataConverter)
                 newval = converter.toFieldValue(newvalRaw)
 
+                if bulk is not None:
+                    bulkFields[name] = field_
+                    bulkValues[name] = newval
+                    continue
                 dm = zope.component.getMultiAdapter(
                     (obj, field_), interfaces.IDataManager)
                 oldval = dm.query()
@@ -125,12 +134,15 @@ class ObjectConverter(BaseDataConverter):
                         or zope.schema.interfaces.IObject.providedBy(field_)):
                     dm.set(newval)
                     names.append(name)
+        if bulkValues:
+            names = util.setChangedValues(obj, bulk, bulkFields, bulkValues)
 
         if names:
-            zope.event.notify(
-                zope.lifecycleevent.ObjectModifiedEvent(
-                    obj, zope.lifecycleevent.Attributes(
-                        self.field.schema, *names)))
+            # The value is converted whenever the data of the form is
+            # extracted, but the object is notified once per request.
+            util.notifyModified(
+                self.widget.request, obj, zope.lifecycleevent.Attributes(
+                    self.field.schema, *names))
 
         # Commonly the widget context is security proxied. This method,
         # however, should return a bare object, so let's remove the
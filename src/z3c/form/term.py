@@ -15,6 +15,7 @@
 
 $Id$
 """
+import functools
 
 import zope.browser.interfaces
 import zope.component
@@ -27,6 +28,29 @@ from z3c.form import util
 from z3c.form.i18n import MessageFactory as _
 
 
+@functools.lru_cache(maxsize=None)
+def _customizesLookup(cls, lookup, batch):
+    """Whether a class overrides a lookup method without the batch method
+    using it."""
+    for klass in cls.__mro__:
+        if batch in klass.__dict__:
+            return False
+        if lookup in klass.__dict__:
+            return True
+    return False
+
+
+def _getVocabularyMapping(terms, lookup, batch, name):
+    """Return the ``by_token`` or ``by_value`` mapping of the simple
+    vocabulary of the terms, if the lookup can use it directly."""
+    if _customizesLookup(type(terms), lookup, batch):
+        return None
+    if (getattr(type(terms.terms), lookup, None) is not
+            getattr(vocabulary.SimpleVocabulary, lookup)):
+        return None
+    return getattr(terms.terms, name)
+
+
 @zope.interface.implementer(interfaces.ITerms)
 class Terms:
     """Base implementation for custom ITerms."""
@@ -40,6 +64,29 @@ class Terms:
     def getValue(self, token):
         return self.getTermByToken(token).value
 
+    def getTermsByTokens(self, tokens):
+        byToken = _getVocabularyMapping(
+            self, 'getTermByToken', 'getTermsByTokens', 'by_token')
+        if byToken is None:
+            return util.lookupTerms(self.getTermByToken, tokens)
+        try:
+            tokens = set(tokens)
+        except TypeError:
+            return util.lookupTerms(self.getTermByToken, tokens)
+        return {token: byToken[token] for token in byToken.keys() & tokens}
+
+    def getTermsByValues(self, values):
+        byValue = _getVocabularyMapping(
+            self, 'getTerm', 'getTermsByValues', 'by_value')
+        if byValue is None:
+            return util.lookupTerms(self.getTerm, values)
+        try:
+            values = set(values)
+        except TypeError:
+            # Values which cannot be hashed are not in the mapping anyway.
+            return util.lookupTerms(self.getTerm, values)
+        return {value: byValue[value] for value in byValue.keys() & values}
+
     def __iter__(self):
         return iter(self.terms)
 
@@ -79,6 +126,25 @@ class SourceTerms(Terms):
                 return term
         raise LookupError(token)
 
+    def getTermsByTokens(self, tokens):
+        if _customizesLookup(
+                type(self), 'getTermByToken', 'getTermsByTokens'):
+            return util.lookupTerms(self.getTermByToken, tokens)
+        # Look up the values of the tokens instead of iterating the source.
+        terms = {}
+        for token in set(tokens):
+            try:
+                value = self.terms.getValue(token)
+            except (LookupError, ValueError, TypeError):
+                # Tokens come from the request and may be malformed.
+                continue
+            if value not in self.source:
+                continue
+            term = self.terms.getTerm(value)
+            if term.token == token:
+                terms[token] = term
+        return terms
+
     def getValue(self, token):
         try:
             return self.terms.getValue(token)
@@ -137,6 +203,9 @@ class ChoiceTermsVocabulary(Terms):
 class MissingTermsBase:
     """Base class for MissingTermsMixin classes."""
 
+    _currentValues = None
+    _missingTerms = None
+
     def _canQueryCurrentValue(self):
         return (interfaces.IContextAware.providedBy(self.widget) and
                 not self.widget.ignoreContext)
@@ -146,15 +215,55 @@ class MissingTermsBase:
             (self.widget.context, self.field),
             interfaces.IDataManager).query()
 
+    def _queryCurrentValues(self):
+        return [self._queryCurrentValue()]
+
+    def _getCurrentValues(self):
+        """Return the current values of the context, queried once"""
+        if self._currentValues is None:
+            if self._canQueryCurrentValue():
+                self._currentValues = self._queryCurrentValues()
+            else:
+                self._currentValues = []
+        return self._currentValues
+
+    def _getMissingTerms(self):
+        """Return a mapping of the tokens of the current values to the terms
+        to display for them, built on the first miss"""
+        if self._missingTerms is None:
+            values = self._getCurrentValues()
+            if (type(self)._makeMissingTerm is
+                    MissingTermsBase._makeMissingTerm):
+                terms = map(self._makeTokenMissingTerm,
+                            values, self._makeTokens(values))
+            else:
+                # respect customized terms
+                terms = map(self._makeMissingTerm, values)
+            self._missingTerms = {}
+            for term in terms:
+                self._missingTerms.setdefault(term.token, term)
+        return self._missingTerms
+
     def _makeToken(self, value):
         """create a unique valid ASCII token"""
         return util.createCSSId(util.toUnicode(value))
 
+    def _makeTokens(self, values):
+        """create the tokens of all given values at once"""
+        if type(self)._makeToken is not MissingTermsBase._makeToken:
+            # respect customized tokens
+            return [self._makeToken(value) for value in values]
+        return util.createCSSIds([util.toUnicode(value) for value in values])
+
     def _makeMissingTerm(self, value):
         """Return a term that should be displayed for the missing token"""
+        return self._makeTokenMissingTerm(value, self._makeToken(value))
+
+    def _makeTokenMissingTerm(self, value, token):
+        """Return the term of a missing value with the given token"""
         uvalue = util.toUnicode(value)
         return vocabulary.SimpleTerm(
-            value, self._makeToken(value),
+            value, token,
             title=_('Missing: ${value}', mapping=dict(value=uvalue)))
 
 
@@ -166,25 +275,20 @@ class MissingTermsMixin(MissingTermsBase):
         try:
             return super().getTerm(value)
         except LookupError:
-            if self._canQueryCurrentValue():
-                curValue = self._queryCurrentValue()
-                if curValue == value:
-                    return self._makeMissingTerm(value)
+            if value in self._getCurrentValues():
+                return self._makeMissingTerm(value)
             raise
 
     def getTermByToken(self, token):
         try:
             return super().getTermByToken(token)
         except LookupError:
-            if self._canQueryCurrentValue():
-                value = self._queryCurrentValue()
-                term = self._makeMissingTerm(value)
-                if term.token == token:
-                    # check if the given token matches the value, if not
-                    # fall back on LookupError, otherwise we might accept
-                    # any crap coming from the request
-                    return term
-
+            # check if the given token matches the value, if not
+            # fall back on LookupError, otherwise we might accept
+            # any crap coming from the request
+            term = self._getMissingTerms().get(token)
+            if term is not None:
+                return term
             raise LookupError(token)
 
 
@@ -276,43 +380,66 @@ class CollectionTermsVocabulary(Terms):
 class MissingCollectionTermsMixin(MissingTermsBase):
     """`MissingTermsMixin` adapted to collections."""
 
+    def _queryCurrentValues(self):
+        return list(self._queryCurrentValue() or ())
+
     def getTerm(self, value):
         try:
             return super().getTerm(value)
         except LookupError:
-            if self._canQueryCurrentValue():
-                if value in self._queryCurrentValue():
-                    return self._makeMissingTerm(value)
+            if value in self._getCurrentValues():
+                return self._makeMissingTerm(value)
             raise
 
     def getTermByToken(self, token):
         try:
             return super().getTermByToken(token)
         except LookupError:
-            if self._canQueryCurrentValue():
-                for value in self._queryCurrentValue():
-                    term = self._makeMissingTerm(value)
-                    if term.token == token:
-                        # check if the given token matches the value, if not
-                        # fall back on LookupError, otherwise we might accept
-                        # any crap coming from the request
-                        return term
+            # check if the given token matches a value, if not
+            # fall back on LookupError, otherwise we might accept
+            # any crap coming from the request
+            term = self._getMissingTerms().get(token)
+            if term is not None:
+                return term
             raise
 
     def getValue(self, token):
         try:
             return super().getValue(token)
         except LookupError:
-            if self._canQueryCurrentValue():
-                for value in self._queryCurrentValue():
-                    term = self._makeMissingTerm(value)
-                    if term.token == token:
-                        # check if the given token matches the value, if not
-                        # fall back on LookupError, otherwise we might accept
-                        # any crap coming from the request
-                        return value
+            term = self._getMissingTerms().get(token)
+            if term is not None:
+                return term.value
             raise
 
+    def getTermsByTokens(self, tokens):
+        terms = super().getTermsByTokens(tokens)
+        missing = set(tokens).difference(terms)
+        if missing:
+            missingTerms = self._getMissingTerms()
+            for token in missing.intersection(missingTerms):
+                terms[token] = missingTerms[token]
+        return terms
+
+    def getTermsByValues(self, values):
+        terms = super().getTermsByValues(values)
+        if len(terms) < len(values):
+            current = self._getCurrentValues()
+            try:
+                current = set(current)
+                missing = [value for value in values
+                           if value not in terms and value in current]
+            except TypeError:
+                # Some values cannot be hashed, compare them to each other.
+                current = self._getCurrentValues()
+                terms = util.TermsByKey(terms.items())
+                missing = [value for value in values
+                           if value not in terms and value in current]
+            for value in missing:
+                if value not in terms:
+                    terms[value] = self._makeMissingTerm(value)
+        return terms
+
 
 class MissingCollectionTermsVocabulary(MissingCollectionTermsMixin,
                                        CollectionTermsVocabulary):
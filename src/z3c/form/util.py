@@ -16,14 +16,38 @@
 """
 __docformat__ = "reStructuredText"
 import binascii
+import bisect
+import concurrent.futures
+import copy
+import functools
+import hashlib
 import re
 import string
+import threading
+import weakref
 from collections import OrderedDict
+from collections.abc import Mapping
 from functools import total_ordering
 
+import zope.component
 import zope.contenttype
+import zope.event
 import zope.interface
+import zope.lifecycleevent
 import zope.schema
+from zope.component.hooks import getSite
+from zope.component.hooks import setSite
+from zope.i18n import translate
+from zope.i18n.interfaces import IUserPreferredLanguages
+from zope.i18nmessageid import Message
+from zope.security.checker import defineChecker
+from zope.security.checker import getCheckerForInstancesOf
+from zope.security.checker import undefineChecker
+from zope.security.interfaces import IParticipation
+from zope.security.management import endInteraction
+from zope.security.management import newInteraction
+from zope.security.management import queryInteraction
+from zope.security.proxy import removeSecurityProxy
 
 from z3c.form import interfaces
 from z3c.form.i18n import MessageFactory as _
@@ -32,6 +56,11 @@ from z3c.form.i18n import MessageFactory as _
 _identifier = re.compile('[A-Za-z][a-zA-Z0-9_]*$')
 classTypes = (type,)
 _acceptableChars = string.ascii_letters + string.digits + '_-'
+_marker = object()
+
+# Bounded cache of interfaces generated by ``getSpecification()``.
+_generatedSpecifications = {}
+_generatedSpecificationsSize = 1000
 
 
 def toUnicode(obj):
@@ -48,6 +77,7 @@ def toBytes(obj):
     return str(obj).encode('utf-8')
 
 
+@functools.lru_cache(maxsize=1024)
 def createId(name):
     """Returns a *native* string as id of the given name."""
     if _identifier.match(name):
@@ -70,11 +100,213 @@ def sortedNone(items):
     return sorted(items, key=lambda x: Min if x is None else x)
 
 
+class _CSSIdTable(dict):
+    """Translation table for ``str.translate()`` creating CSS ids.
+
+    The replacement of each character is computed on first use. Only
+    characters of the basic multilingual plane are remembered, so the table
+    cannot grow beyond 65536 entries.
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char in _acceptableChars:
+            replacement = char
+        else:
+            replacement = binascii.hexlify(char.encode('utf-8')).decode()
+        if codepoint <= 0xFFFF:
+            self[codepoint] = replacement
+        return replacement
+
+
+_cssIdTable = _CSSIdTable()
+
+
 def createCSSId(name):
-    return str(''.join([
-        (char if char in _acceptableChars else
-         binascii.hexlify(char.encode('utf-8')).decode())
-        for char in name]))
+    return str(name.translate(_cssIdTable))
+
+
+def createCSSIds(names):
+    """Return the CSS ids of all the given names.
+
+    This is the same as calling ``createCSSId()`` for each name, but saves
+    the function call overhead when creating tokens of whole vocabularies.
+    """
+    table = _cssIdTable
+    return [str(name.translate(table)) for name in names]
+
+
+def getVocabularyName(field):
+    """Get the name of the vocabulary of a choice, or collection of choices.
+
+    ``None`` is returned for other fields and choices without a named
+    vocabulary.
+    """
+    if zope.schema.interfaces.ICollection.providedBy(field):
+        field = field.value_type
+    if not zope.schema.interfaces.IChoice.providedBy(field):
+        return None
+    return field.vocabularyName
+
+
+CONCURRENT_WORKERS = 8
+
+_workerState = threading.local()
+
+
+@zope.interface.implementer(IParticipation)
+class WorkerParticipation:
+    """Take part in the interaction of a worker thread for a participation.
+
+    A participation only belongs to one interaction at a time, so the
+    interactions of the worker threads get one of these with the principal of
+    the participation each.
+    """
+
+    interaction = None
+
+    def __init__(self, participation):
+        self.participation = participation
+        self.principal = getattr(participation, 'principal', None)
+
+
+def mapConcurrently(function, items):
+    """Call a function for all items concurrently in worker threads.
+
+    The results are returned in the order of the items, and the exception of
+    the first item failing is raised. The function is called with the site of
+    the calling thread, and within a new security interaction with the
+    principals taking part in the calling thread's interaction, e.g. the one
+    of the request, see ``WorkerParticipation``.
+
+    The function must only access objects which are safe to use from several
+    threads. This is not true for persistent objects, since ZODB connections
+    must only be used by one thread.
+
+    The worker threads, at most ``CONCURRENT_WORKERS``, are started for the
+    call and are finished when it returns. Calls made from a worker thread
+    call the function for the items one after the other.
+    """
+    items = list(items)
+    if len(items) < 2 or getattr(_workerState, 'active', False):
+        return [function(item) for item in items]
+    site = getSite()
+    interaction = queryInteraction()
+    participations = ()
+    if interaction is not None:
+        participations = tuple(getattr(interaction, 'participations', ()))
+
+    def call(item):
+        _workerState.active = True
+        setSite(site)
+        if interaction is not None:
+            newInteraction(*[WorkerParticipation(participation)
+                             for participation in participations])
+        try:
+            return function(item)
+        finally:
+            if interaction is not None:
+                endInteraction()
+            setSite(None)
+            _workerState.active = False
+
+    with concurrent.futures.ThreadPoolExecutor(
+            min(CONCURRENT_WORKERS, len(items)),
+            thread_name_prefix='z3c.form') as executor:
+        return list(executor.map(call, items))
+
+
+# Subclasses generated by ``alsoProvides()``, by base class and interfaces,
+# and the base class and interfaces of each of them.
+_providingClasses = {}
+_providingClassesSize = 1000
+_providingClassesLock = threading.Lock()
+_providedInterfaces = {}
+
+
+def _getProvidingClass(base, interfaces):
+    key = (base, interfaces)
+    subclass = _providingClasses.get(key)
+    if subclass is None:
+        with _providingClassesLock:
+            subclass = _providingClasses.get(key)
+            if subclass is None:
+                if len(_providingClasses) >= _providingClassesSize:
+                    return None
+                # The subclass has the name of the base class, so that the
+                # representations of its objects stay the same.
+                subclass = type(base.__name__, (base,), {
+                    '__module__': base.__module__,
+                    '__qualname__': base.__qualname__,
+                    '__doc__': base.__doc__,
+                    '__reduce_ex__': _reduceProvidingObject,
+                })
+                zope.interface.classImplements(subclass, *interfaces)
+                _providedInterfaces[subclass] = key
+                _providingClasses[key] = subclass
+    # Security declarations are made for the class only, and can change
+    # e.g. when the configuration is loaded.
+    checker = getCheckerForInstancesOf(base)
+    if getCheckerForInstancesOf(subclass) is not checker:
+        with _providingClassesLock:
+            if getCheckerForInstancesOf(subclass) is not None:
+                undefineChecker(subclass)
+            if checker is not None:
+                defineChecker(subclass, checker)
+    return subclass
+
+
+def _reduceProvidingObject(obj, protocol):
+    # The generated classes cannot be found by their name, so objects of them
+    # are pickled as objects of the base class with the interfaces.
+    getState = getattr(obj, '__getstate__', None)
+    state = obj.__dict__ if getState is None else getState()
+    return (_restoreProvidingObject, _providedInterfaces[type(obj)], state)
+
+
+def _restoreProvidingObject(base, interfaces):
+    obj = base.__new__(base)
+    alsoProvides(obj, *interfaces)
+    return obj
+
+
+def alsoProvides(obj, *interfaces):
+    """Declare that an object provides the given interfaces.
+
+    This works like ``zope.interface.alsoProvides()``, but skips the
+    interfaces the object already provides.
+
+    Classes can set ``declaresInterfacesByClass`` to a true value. Then the
+    class of their objects is replaced by a generated subclass implementing
+    the interfaces instead. The subclasses are generated once per class and
+    interfaces, so that objects with the same interfaces share their
+    specification and thus the adapter lookup caches. The generated classes
+    have the name of the original class, and their objects are pickled as
+    objects of the original class providing the interfaces.
+
+    Objects which already have declarations of their own or whose class
+    cannot be replaced get the interfaces declared as usual.
+    """
+    missing = tuple(iface for iface in interfaces
+                    if not iface.providedBy(obj))
+    if not missing:
+        return
+    cls = type(obj)
+    subclass = None
+    if (getattr(cls, 'declaresInterfacesByClass', False) and
+            '__provides__' not in getattr(obj, '__dict__', ('__provides__',))):
+        # Extend the interfaces of a generated class, so that the interfaces
+        # are in the order ``zope.interface.alsoProvides()`` gives them.
+        base, provided = _providedInterfaces.get(cls, (cls, ()))
+        subclass = _getProvidingClass(base, provided + missing)
+    if subclass is not None:
+        try:
+            obj.__class__ = subclass
+            return
+        except TypeError:
+            # e.g. the layout of a class with ``__slots__`` differs
+            pass
+    zope.interface.alsoProvides(obj, *missing)
 
 
 def getSpecification(spec, force=False):
@@ -93,6 +325,18 @@ def getSpecification(spec, force=False):
          not zope.interface.interfaces.ISpecification.providedBy(spec)
          and not isinstance(spec, classTypes))):
 
+        # Step 0: Look for an interface generated earlier. The cache only
+        #         holds weak references, so a cached entry is only valid as
+        #         long as the object with that id still is the same one.
+        cached = _generatedSpecifications.get(id(spec))
+        if cached is not None and cached[0]() is spec:
+            iface = cached[1]
+            if not iface.providedBy(spec):
+                # The declarations of the object were changed since, so
+                # declare the interface again.
+                zope.interface.alsoProvides(spec, iface)
+            return iface
+
         # Step 1: Calculate an interface name
         ifaceName = 'IGeneratedForObject_%i' % id(spec)
 
@@ -104,15 +348,262 @@ def getSpecification(spec, force=False):
 
         # Step 3a: Return an existing interface if there is one
         if len(existingInterfaces) > 0:
-            spec = existingInterfaces[0]
+            iface = existingInterfaces[0]
         # Step 3b: Create a new interface if not
         else:
             iface = zope.interface.interface.InterfaceClass(ifaceName)
             zope.interface.alsoProvides(spec, iface)
-            spec = iface
+        # Step 4: Remember the interface
+        try:
+            ref = weakref.ref(spec)
+        except TypeError:
+            # Objects that cannot be weakly referenced are not cached.
+            pass
+        else:
+            if len(_generatedSpecifications) >= _generatedSpecificationsSize:
+                _generatedSpecifications.clear()
+            _generatedSpecifications[id(spec)] = (ref, iface)
+        spec = iface
     return spec
 
 
+def getAdapterRegistryGeneration():
+    """Get a token identifying the current state of the adapter registry.
+
+    The token changes whenever an adapter is registered or unregistered in
+    the current site manager or any of its bases, so it can be used to
+    invalidate caches of adapter lookups.
+    """
+    return _getRegistryGeneration(zope.component.getSiteManager().adapters)
+
+
+def getUtilityRegistryGeneration():
+    """Get a token identifying the current state of the utility registry.
+
+    This is the same as ``getAdapterRegistryGeneration()`` for utilities.
+    """
+    return _getRegistryGeneration(zope.component.getSiteManager().utilities)
+
+
+def _getRegistryGeneration(registry):
+    # Changes of base registries are not reliably propagated to the
+    # generation of local registries, so take all of them into account.
+    return (registry,) + tuple(base._generation for base in registry.ro)
+
+
+def getTermsETag(terms):
+    """Get an ETag of the given terms.
+
+    The ETag changes whenever the token or title of any term changes.
+    """
+    digest = hashlib.md5(usedforsecurity=False)
+    for term in terms:
+        title = getattr(term, 'title', None) or ''
+        digest.update(f'{term.token}\0{title}\0'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class TermsByKey(Mapping):
+    """A mapping of keys to terms, which also works with keys which cannot be
+    hashed, by comparing them to all keys.
+    """
+
+    def __init__(self, items=()):
+        self._items = list(items)
+
+    def __getitem__(self, key):
+        for itemKey, term in self._items:
+            if itemKey == key:
+                return term
+        raise KeyError(key)
+
+    def __setitem__(self, key, term):
+        self._items.append((key, term))
+
+    def __iter__(self):
+        return (key for key, term in self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+def lookupTerms(lookup, keys):
+    """Look up the terms of the given keys one by one.
+
+    Returns a mapping of the keys to their terms. Keys, for which ``lookup``
+    raises a ``LookupError``, are left out. If a key cannot be hashed, the
+    mapping is a ``TermsByKey`` instance.
+    """
+    keys = list(keys)
+    terms = {}
+    try:
+        for key in keys:
+            hash(key)
+    except TypeError:
+        terms = TermsByKey()
+    for key in keys:
+        if key in terms:
+            continue
+        try:
+            terms[key] = lookup(key)
+        except LookupError:
+            pass
+    return terms
+
+
+def queryTermByKey(terms, key, default=None):
+    """Get the term of a key from a mapping returned by ``lookupTerms()`` or
+    the batch methods of ``ITerms``.
+
+    Keys which cannot be hashed are compared to all keys of the mapping.
+    """
+    try:
+        return terms.get(key, default)
+    except TypeError:
+        for itemKey, term in terms.items():
+            if itemKey == key:
+                return term
+        return default
+
+
+def getTermsByTokens(terms, tokens):
+    """Return a mapping of the given tokens to their terms.
+
+    The batch method of the terms is used. Terms not having one, like custom
+    ``ITerms`` implementations written before, get each token looked up.
+    """
+    if hasattr(terms, 'getTermsByTokens'):
+        return terms.getTermsByTokens(tokens)
+    return lookupTerms(terms.getTermByToken, tokens)
+
+
+def getTermsByValues(terms, values):
+    """Return a mapping of the given values to their terms.
+
+    See ``getTermsByTokens()``.
+    """
+    if hasattr(terms, 'getTermsByValues'):
+        return terms.getTermsByValues(values)
+    return lookupTerms(terms.getTerm, values)
+
+
+PREFERRED_LANGUAGES_KEY = 'z3c.form.util.preferredLanguages'
+
+
+def getPreferredLanguages(request):
+    """Get the languages preferred by the user of the request.
+
+    The ``Accept-Language`` header is used if the request cannot be adapted
+    to ``IUserPreferredLanguages``. The languages are computed once per
+    request and stored in the request's annotations.
+    """
+    annotations = getattr(request, 'annotations', None)
+    if annotations is not None:
+        cached = annotations.get(PREFERRED_LANGUAGES_KEY)
+        if cached is not None:
+            return cached
+    adapter = IUserPreferredLanguages(request, None)
+    if adapter is not None:
+        languages = tuple(adapter.getPreferredLanguages())
+    else:
+        languages = (request.getHeader('Accept-Language', ''),)
+    if annotations is not None:
+        annotations[PREFERRED_LANGUAGES_KEY] = languages
+    return languages
+
+
+class LRUCache:
+    """A thread-safe mapping keeping the most recently used items only.
+
+    Every key belongs to a group, e.g. the context an item was computed for,
+    so that all items of a group can be removed at once.
+    """
+
+    def __init__(self, size=1000):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def hitRate(self):
+        """The share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                group, value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, group=None):
+        with self._lock:
+            self._discard(key)
+            self._items[key] = (group, value)
+            self._groups.setdefault(group, set()).add(key)
+            while len(self._items) > self.size:
+                self._discard(next(iter(self._items)))
+
+    def invalidate(self, group):
+        """Remove all items of the given group."""
+        with self._lock:
+            for key in self._groups.pop(group, ()):
+                del self._items[key]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._groups.clear()
+            self.hits = self.misses = 0
+
+    def _discard(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            keys = self._groups[item[0]]
+            keys.discard(key)
+            if not keys:
+                del self._groups[item[0]]
+
+
+# Translated titles of terms by language, see ``translateTitle()``.
+translatedTitles = LRUCache(10000)
+
+
+def translateTitle(title, request):
+    """Translate the title of a term for the user of the request.
+
+    This is the same as ``translate(title, context=request, default=title)``,
+    but the translations are kept in a bounded cache shared by all widgets.
+    The cache is keyed by the title and the preferred languages of the user,
+    which decide the translation as long as the translation domains (utility
+    registrations) stay the same.
+    """
+    if (not isinstance(title, Message) or not title.domain or
+            title.mapping):
+        # Nothing to look up in a translation domain, or a translation
+        # which depends on the mapping.
+        return translate(title, context=request, default=title)
+    languages = getPreferredLanguages(request)
+    key = (getUtilityRegistryGeneration(), languages, str(title),
+           title.domain, title.default)
+    translated = translatedTitles.get(key, _marker)
+    if translated is _marker:
+        translated = translate(title, context=request, default=title)
+        translatedTitles.set(key, translated, languages)
+    return translated
+
+
 def expandPrefix(prefix):
     """Expand prefix string by adding a trailing period if needed.
 
@@ -164,6 +655,58 @@ def extractFileName(form, id, cleanup=True, allowEmptyPostfix=False):
     return widget.filename
 
 
+def getFileSize(file):
+    """Get the size of a seekable file without reading it."""
+    position = file.tell()
+    file.seek(0, 2)
+    size = file.tell()
+    file.seek(position)
+    return size
+
+
+CONTENT_TYPE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'%PDF-', 'application/pdf'),
+    (b'PK\x03\x04', 'application/zip'),
+    (b'MZ', 'application/x-msdownload'),
+    (b'\x7fELF', 'application/x-executable'),
+)
+
+
+def sniffContentType(data):
+    """Recognize the content type of a file from its first bytes.
+
+    Some common binary formats are recognized by their signature, HTML and
+    XML by ``zope.contenttype``. ``None`` is returned for other data.
+    """
+    for signature, contentType in CONTENT_TYPE_SIGNATURES:
+        if data.startswith(signature):
+            return contentType
+    if data and zope.contenttype.find_binary(data) is None:
+        contentType = zope.contenttype.text_type(data)
+        if contentType != 'text/plain':
+            return contentType
+    return None
+
+
+def matchesContentType(contentType, allowed):
+    """Whether a content type matches one of the allowed types.
+
+    Parameters of the content type are ignored; an allowed type may use
+    ``*`` as subtype, e.g. ``image/*``.
+    """
+    contentType = contentType.split(';')[0].strip().lower()
+    major = contentType.split('/')[0]
+    for allowedType in allowed:
+        allowedType = allowedType.lower()
+        if allowedType in (contentType, major + '/*', '*/*'):
+            return True
+    return False
+
+
 def changedField(field, value, context=None):
     """Figure if a field's value changed
 
@@ -188,6 +731,95 @@ def changedField(field, value, context=None):
         return False
 
 
+def setChangedValues(context, bulk, fields, values):
+    """Set the changed values of a context with one call of its bulk manager.
+
+    ``bulk`` is the ``IBulkDataManager`` of the context, ``fields`` maps
+    names to schema fields and ``values`` maps the same names to the new
+    values. The values are compared like ``changedField()`` does. Return the
+    names of the changed values.
+    """
+    oldValues = bulk.query(fields)
+    changed = {}
+    for name, value in values.items():
+        field = fields[name]
+        if name not in oldValues:
+            if not changedField(field, value, context=context):
+                continue
+        elif (not zope.schema.interfaces.IObject.providedBy(field) and
+                oldValues[name] == value):
+            continue
+        changed[name] = value
+    if changed:
+        bulk.set({name: fields[name] for name in changed}, changed)
+    return list(changed)
+
+
+def getRequestData(request, key, obj, *discriminators):
+    """Get a dictionary of data about an object for the lifetime of a request.
+
+    The dictionaries are stored in the request's annotations under the given
+    key, by the id of the object and the discriminators. The object is kept
+    with its dictionary, so that its id is not reused by another object
+    during the request. Requests without annotations get an empty dictionary,
+    which is not kept.
+    """
+    annotations = getattr(request, 'annotations', None)
+    if annotations is None:
+        return {}
+    data = annotations.setdefault(key, {})
+    return data.setdefault((id(obj),) + discriminators, (obj, {}))[1]
+
+
+def _snapshot(value):
+    # A copy of a value to compare it with later, so that changes made to
+    # the value in place are seen.
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        # A value which cannot be copied is always considered changed.
+        return _marker
+
+
+MODIFIED_ATTRIBUTES_KEY = 'z3c.form.util.modifiedAttributes'
+
+
+def notifyModified(request, obj, *descriptions):
+    """Notify an ``ObjectModifiedEvent`` for changes made by a request.
+
+    Copies of the values of the attributes notified for an object are stored
+    with ``getRequestData()``. Attributes having the same value again are
+    left out of later events of the same request, so that an object changed
+    again while the same submission is processed, e.g. by extracting the data
+    of a form twice, is not notified again. No event is sent if no attribute
+    remains.
+    """
+    bare = removeSecurityProxy(obj)
+    seen = getRequestData(request, MODIFIED_ATTRIBUTES_KEY, bare)
+    remaining = []
+    for description in descriptions:
+        interface = description.interface
+        adapted = bare
+        if interface is not None:
+            adapted = interface(bare, bare)
+        names = []
+        for name in description.attributes:
+            value = getattr(adapted, name, _marker)
+            previous = seen.get((interface, name), _marker)
+            if (value is not _marker and previous is not _marker and
+                    previous == value):
+                continue
+            seen[(interface, name)] = _snapshot(value)
+            names.append(name)
+        if names:
+            remaining.append(zope.lifecycleevent.Attributes(
+                description.interface, *names))
+    if not remaining:
+        return
+    zope.event.notify(
+        zope.lifecycleevent.ObjectModifiedEvent(obj, *remaining))
+
+
 def changedWidget(widget, value, field=None, context=None):
     """figure if a widget's value changed
 
@@ -204,17 +836,75 @@ def changedWidget(widget, value, field=None, context=None):
     return True
 
 
+def insertAtPositions(keys, insertions):
+    """Insert keys at the given positions into a list of keys.
+
+    ``insertions`` is a sequence of ``(position, key)`` pairs. The result is
+    the same as calling ``list.insert(position, key)`` for each pair in turn,
+    but the cost only grows linearly with the number of ``keys``.
+    """
+    keys = list(keys)
+    insertions = list(insertions)
+    if not insertions:
+        return keys
+    # Normalize the positions like ``list.insert()`` does for the length of
+    # the list at the time of each insertion.
+    normalized = []
+    length = len(keys)
+    for position, key in insertions:
+        if position < 0:
+            position = max(position + length, 0)
+        normalized.append((min(position, length), key))
+        length += 1
+    # A later insertion keeps its position in the final list, earlier ones
+    # take the n-th slot not occupied by later insertions.
+    taken = []
+    slots = {}
+    for position, key in reversed(normalized):
+        slot = position
+        for occupied in taken:
+            if occupied <= slot:
+                slot += 1
+            else:
+                break
+        bisect.insort(taken, slot)
+        slots[slot] = key
+    result = []
+    remaining = iter(keys)
+    for index in range(length):
+        if index in slots:
+            result.append(slots[index])
+        else:
+            result.append(next(remaining))
+    return result
+
+
 @zope.interface.implementer(interfaces.IManager)
 class Manager(OrderedDict):
     """Non-persistent IManager implementation."""
 
     def create_according_to_list(self, d, l_):
         """Arrange elements of d according to sorting of l_."""
-        # TODO: If we are on Python 3 only reimplement on top of `move_to_end`
-        self.clear()
+        order = []
+        wanted = set()
         for key in l_:
-            if key in d:
-                self[key] = d[key]
+            if key in d and key not in wanted:
+                wanted.add(key)
+                order.append(key)
+        # Step 1: Remove the items that are not wanted anymore.
+        for key in [key for key in self.keys() if key not in wanted]:
+            del self[key]
+        # Step 2: Set new and changed items, existing keys keep their place.
+        for key in order:
+            value = d[key]
+            if OrderedDict.get(self, key, _marker) is not value:
+                self[key] = value
+        # Step 3: Reorder in place, starting at the first misplaced key.
+        for index, (current, key) in enumerate(zip(self.keys(), order)):
+            if current != key:
+                for key in order[index:]:
+                    self.move_to_end(key)
+                break
 
     def __getitem__(self, key):
         if key not in self:
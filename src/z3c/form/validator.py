@@ -123,6 +123,34 @@ class FileUploadValidator(StrictSimpleFieldValidator):
     # to be validated, because file upload is a special case
     # the most special case if when an ad-hoc IBytes field is required
 
+    def validate(self, value, force=False):
+        """See interfaces.IValidator"""
+        if interfaces.IUploadedFile.providedBy(value):
+            field = self.field
+            storage = zope.component.queryMultiAdapter(
+                (self.context, field), interfaces.IUploadedFileStorage)
+            if storage is None:
+                # The data managers store the data as bytes, so it is
+                # validated like bytes.
+                value.seek(0)
+                data = value.read()
+                value.seek(0)
+                return super().validate(data, force)
+            # Check the size without reading the file, the storage checks
+            # the rest.
+            size = value.size
+            minLength = getattr(field, 'min_length', None)
+            if minLength is not None and size < minLength:
+                raise zope.schema.interfaces.TooShort(
+                    value, minLength).with_field_and_value(field, value)
+            maxLength = getattr(field, 'max_length', None)
+            if maxLength is not None and size > maxLength:
+                raise zope.schema.interfaces.TooLong(
+                    value, maxLength).with_field_and_value(field, value)
+            storage.validate(value)
+            return
+        return super().validate(value, force)
+
 
 def WidgetValidatorDiscriminators(
         validator,
@@ -19,9 +19,10 @@ import zope.interface
 import zope.location
 import zope.schema.interfaces
 from zope.browserpage.viewpagetemplatefile import ViewPageTemplateFile
-from zope.i18n import translate
+from zope.lifecycleevent.interfaces import IObjectModifiedEvent
 from zope.pagetemplate.interfaces import IPageTemplate
 from zope.schema.fieldproperty import FieldProperty
+from zope.security.proxy import removeSecurityProxy
 
 from z3c.form import interfaces
 from z3c.form import util
@@ -30,6 +31,10 @@ from z3c.form import value
 
 PLACEHOLDER = object()
 
+# Output of display widgets having ``cacheDisplay`` set, grouped by their
+# persistent context.
+displayFragmentCache = util.LRUCache(1000)
+
 StaticWidgetAttribute = value.StaticValueCreator(
     discriminators=('context', 'request', 'view', 'field', 'widget')
 )
@@ -51,6 +56,7 @@ class Widget(zope.location.Location):
     value = FieldProperty(interfaces.IWidget['value'])
     template = None
     layout = None
+    cacheDisplay = False
     ignoreRequest = FieldProperty(interfaces.IWidget['ignoreRequest'])
     ignoreRequiredOnValidation = FieldProperty(
         interfaces.IWidget['ignoreRequiredOnValidation'])
@@ -70,6 +76,12 @@ class Widget(zope.location.Location):
 
     # Internal attributes
     _adapterValueAttributes = ('label', 'name', 'required', 'title')
+    # The value of the field in the context read by the widget manager in
+    # advance, see ``interfaces.IBulkDataManager``. It is used once.
+    _prefetchedValue = None
+    # The field bound to the context by the widget manager in advance, see
+    # ``FieldWidgets.prefetchVocabularies``. It is used by one update.
+    _prefetchedField = None
 
     def __init__(self, request):
         self.request = request
@@ -79,6 +91,10 @@ class Widget(zope.location.Location):
         # Step 1: Determine the value.
         value = interfaces.NO_VALUE
         lookForDefault = False
+        # Use the prefetched value and field once, without adding attributes
+        # to widgets which got none.
+        prefetched = self.__dict__.pop('_prefetchedValue', None)
+        boundField = self.__dict__.pop('_prefetchedField', None)
         # Step 1.1: If possible, get a value from the request
         if not self.ignoreRequest:
             # at this turn we do not need errors to be set on widgets
@@ -100,15 +116,18 @@ class Widget(zope.location.Location):
             #              it now via a data manager.
             if (interfaces.IContextAware.providedBy(self) and
                     not self.ignoreContext):
-                value = zope.component.getMultiAdapter(
-                    (self.context, self.field),
-                    interfaces.IDataManager).query()
+                if prefetched is not None:
+                    value = prefetched[0]
+                else:
+                    value = zope.component.getMultiAdapter(
+                        (self.context, self.field),
+                        interfaces.IDataManager).query()
             # Step 1.2.2: If we still do not have a value, we can always use
             #             the default value of the field, if set
             # NOTE: It should check field.default is not missing_value, but
             # that requires fixing zope.schema first
             # We get a clone of the field with the context binded
-            field = self.field.bind(self.context)
+            field = boundField or self.field.bind(self.context)
 
             if value is field.missing_value or value is interfaces.NO_VALUE:
                 default_value = field.default
@@ -147,11 +166,45 @@ class Widget(zope.location.Location):
         """Render the plain widget without additional layout"""
         template = self.template
         if template is None:
-            template = zope.component.getMultiAdapter(
-                (self.context, self.request, self.form, self.field, self),
-                IPageTemplate, name=self.mode)
+            template = getWidgetTemplate(self, IPageTemplate, self.mode)
+        if self.cacheDisplay and self.mode == interfaces.DISPLAY_MODE:
+            key = self.getFragmentCacheKey(template)
+            try:
+                hash(key)
+            except TypeError:
+                # The output cannot be cached for unhashable values.
+                return template(self)
+            bare = removeSecurityProxy(self.context)
+            context = getContextKey(bare)
+            # Objects modified, but not committed yet, or whose state is not
+            # loaded, have no serial matching their state.
+            if (context is None or
+                    getattr(bare, '_p_changed', None) is not False):
+                fragments = getRequestFragments(self.request, self.context)
+                html = fragments.get(key)
+                if html is None:
+                    html = fragments[key] = template(self)
+                return html
+            key = (context, bare._p_serial, key)
+            html = displayFragmentCache.get(key)
+            if html is None:
+                html = template(self)
+                displayFragmentCache.set(key, html, context)
+            return html
         return template(self)
 
+    def getFragmentCacheKey(self, template):
+        """Get the key of the rendered widget in the fragment cache.
+
+        The key has to contain everything the output of the template depends
+        on, apart from the context.
+        """
+        value = self.value
+        if isinstance(value, list):
+            value = tuple(value)
+        return (template, self.__class__, self.name, self.mode, self.field,
+                value, util.getPreferredLanguages(self.request))
+
     def json_data(self):
         return {
             'mode': self.mode,
@@ -168,9 +221,8 @@ class Widget(zope.location.Location):
         """Get and return layout template which is calling widget/render"""
         layout = self.layout
         if layout is None:
-            layout = zope.component.getMultiAdapter(
-                (self.context, self.request, self.form, self.field, self),
-                interfaces.IWidgetLayoutTemplate, name=self.mode)
+            layout = getWidgetTemplate(
+                self, interfaces.IWidgetLayoutTemplate, self.mode)
         return layout(self)
 
     def __repr__(self):
@@ -199,37 +251,86 @@ class SequenceWidget(Widget):
 
     noValueToken = '--NOVALUE--'
 
+    # Refer to the vocabulary in ``json_data()`` instead of listing options.
+    optionsByReference = False
+
+    # The page of unselected terms rendered, if the terms are paged.
+    pageSize = 20
+    pageStart = 0
+    query = None
+
     @property
     def displayValue(self):
         value = []
-        for token in self.value:
-            # Ignore no value entries. They are in the request only.
-            if token == self.noValueToken:
-                continue
-            try:
-                term = self.terms.getTermByToken(token)
-            except LookupError:
-                # silently ignore missing tokens, because INPUT_MODE and
-                # HIDDEN_MODE does that too
-                continue
+        for term in self._getSelectedTerms():
             if zope.schema.interfaces.ITitledTokenizedTerm.providedBy(term):
-                value.append(translate(
-                    term.title, context=self.request, default=term.title))
+                value.append(util.translateTitle(term.title, self.request))
             else:
                 value.append(term.value)
         return value
 
+    def getFragmentCacheKey(self, template):
+        """See ``Widget.getFragmentCacheKey()``.
+
+        The output also depends on the terms of the selected tokens, so their
+        translated titles are part of the key.
+        """
+        return super().getFragmentCacheKey(template) + (
+            tuple(self.displayValue),)
+
     def updateTerms(self):
         if self.terms is None:
+            # The widget manager may have bound the field, resolving its
+            # vocabulary, in advance.
+            field = self._prefetchedField or self.field
             self.terms = zope.component.getMultiAdapter(
-                (self.context, self.request, self.form, self.field, self),
+                (self.context, self.request, self.form, field, self),
                 interfaces.ITerms)
         return self.terms
 
+    def _getSelectedTerms(self):
+        # Ignore no value entries. They are in the request only.
+        tokens = [token for token in self.value
+                  if token != self.noValueToken]
+        terms = util.getTermsByTokens(self.terms, tokens)
+        # silently ignore missing tokens, because INPUT_MODE and
+        # HIDDEN_MODE does that too
+        return [terms[token] for token in tokens if token in terms]
+
+    def getVisibleTerms(self):
+        """See z3c.form.interfaces.ISequenceWidget."""
+        if not interfaces.IPagedTerms.providedBy(self.terms):
+            return self.terms
+        terms = self._getSelectedTerms()
+        selected = {term.token for term in terms}
+        if self.query and interfaces.ISearchableTerms.providedBy(self.terms):
+            page = self.terms.search(self.query, self.pageSize)
+        else:
+            page = self.terms.slice(self.pageStart, self.pageSize)
+        terms.extend(term for term in page if term.token not in selected)
+        return terms
+
+    def updatePage(self):
+        """Read the page of paged terms from the request."""
+        if self.ignoreRequest:
+            return
+        # Repeated parameters are lists, which are ignored.
+        query = self.request.get(self.name + '-query')
+        self.query = query if isinstance(query, str) and query else None
+        start = self.request.get(self.name + '-start')
+        if not isinstance(start, str):
+            start = None
+        try:
+            self.pageStart = max(int(start), 0)
+        except (TypeError, ValueError):
+            self.pageStart = 0
+
     def update(self):
         """See z3c.form.interfaces.IWidget."""
         # Create terms first, since we need them for the generic update.
         self.updateTerms()
+        if interfaces.IPagedTerms.providedBy(self.terms):
+            self.updatePage()
         super().update()
 
     def extract(self, default=interfaces.NO_VALUE):
@@ -247,15 +348,48 @@ class SequenceWidget(Widget):
                 # a tuple. the dance is about making return values uniform
                 value = tuple(value)
             # do some kind of validation, at least only use existing values
-            for token in value:
-                if token == self.noValueToken:
-                    continue
-                try:
-                    self.terms.getTermByToken(token)
-                except LookupError:
+            tokens = [token for token in value
+                      if token != self.noValueToken]
+            if tokens:
+                terms = util.getTermsByTokens(self.terms, tokens)
+                if len(terms) < len(set(tokens)):
                     return default
         return value
 
+    def getOptionsReference(self):
+        """Get a reference to the options of the widget.
+
+        The reference consists of the name of the vocabulary and an ETag of
+        its terms, so clients can load and cache the options separately.
+        ``None`` is returned if the vocabulary of the field has no name.
+        Paged terms are not iterated, so their ETag is ``None``.
+        """
+        field = self.field
+        if zope.schema.interfaces.ICollection.providedBy(field):
+            field = field.value_type
+        name = getattr(field, 'vocabularyName', None)
+        if not name:
+            return None
+        if interfaces.IPagedTerms.providedBy(self.terms):
+            return {'vocabulary': name, 'etag': None}
+        return {'vocabulary': name, 'etag': util.getTermsETag(self.terms)}
+
+    def addJSONOptions(self, data):
+        """Add the options of the widget to the data of ``json_data()``.
+
+        If ``optionsByReference`` is set, only a reference to the vocabulary
+        is added, as long as the vocabulary has a name.
+        """
+        if self.optionsByReference:
+            reference = self.getOptionsReference()
+            if reference is not None:
+                data['optionsReference'] = reference
+                return
+        items = self.items
+        if not isinstance(items, (list, tuple)):
+            items = list(items)
+        data['options'] = items
+
     def json_data(self):
         data = super().json_data()
         data['type'] = 'sequence'
@@ -342,8 +476,7 @@ class MultiWidget(Widget):
         # set widget.form (objectwidget needs this)
         if interfaces.IFormAware.providedBy(self):
             widget.form = self.form
-            zope.interface.alsoProvides(
-                widget, interfaces.IFormAware)
+            util.alsoProvides(widget, interfaces.IFormAware)
         widget.update()
         return widget
 
@@ -545,17 +678,102 @@ class MultiWidget(Widget):
         return data
 
 
+def getContextKey(context):
+    """Get a key for the context of widgets in the fragment cache.
+
+    The key consists of the name of the database and the oid of the context,
+    so that it is the same in all connections. ``None`` is returned for
+    contexts, which are not persistent.
+    """
+    context = removeSecurityProxy(context)
+    jar = getattr(context, '_p_jar', None)
+    oid = getattr(context, '_p_oid', None)
+    if jar is None or oid is None:
+        return None
+    db = getattr(jar, 'db', None)
+    name = getattr(db(), 'database_name', None) if db is not None else None
+    if name is None:
+        return None
+    return (name, oid)
+
+
+DISPLAY_FRAGMENTS_KEY = 'z3c.form.widget.displayFragments'
+
+
+def getRequestFragments(request, context):
+    """Get the rendered display widgets of a context, which is not
+    persistent, kept for the lifetime of the request."""
+    return util.getRequestData(request, DISPLAY_FRAGMENTS_KEY, context)
+
+
+@zope.component.adapter(IObjectModifiedEvent)
+def invalidateDisplayFragments(event):
+    """Remove the rendered display widgets of a modified object."""
+    displayFragmentCache.invalidate(getContextKey(event.object))
+
+
+def getWidgetTemplate(widget, provided, name):
+    """Get a template of the widget.
+
+    This is the ``provided`` multi-adapter with the given name for the
+    context, request, form, field and widget.
+    """
+    return zope.component.getMultiAdapter(
+        (widget.context, widget.request, widget.form, widget.field, widget),
+        provided, name=name)
+
+
+_fieldPropertyNames = {}
+
+
+def getFieldPropertyNames(cls):
+    """Get the names of the field properties of a widget class.
+
+    Only field properties storing their value under their own name and which
+    are not read-only are included.
+    """
+    names = _fieldPropertyNames.get(cls)
+    if names is None:
+        names = set()
+        for klass in reversed(cls.__mro__):
+            for name, attr in vars(klass).items():
+                if (isinstance(attr, FieldProperty) and not attr.readonly and
+                        getattr(attr, '_FieldProperty__name', None) == name):
+                    names.add(name)
+                else:
+                    names.discard(name)
+        names = _fieldPropertyNames[cls] = frozenset(names)
+    return names
+
+
+def setWidgetAttributes(widget, **attributes):
+    """Set attributes of a widget computed by the framework.
+
+    The values of field properties are stored directly, i.e. they are neither
+    validated nor is a ``FieldUpdatedEvent`` sent. Other attributes are set
+    as usual.
+    """
+    fieldPropertyNames = getFieldPropertyNames(type(widget))
+    state = widget.__dict__
+    for name, attribute in attributes.items():
+        if name in fieldPropertyNames:
+            state[name] = attribute
+        else:
+            setattr(widget, name, attribute)
+
+
 def FieldWidget(field, widget):
     """Set the field for the widget."""
-    widget.field = field
-    if not interfaces.IFieldWidget.providedBy(widget):
-        zope.interface.alsoProvides(widget, interfaces.IFieldWidget)
+    util.alsoProvides(widget, interfaces.IFieldWidget)
     # Initial values are set. They can be overridden while updating the widget
     # itself later on.
-    widget.name = field.__name__
-    widget.id = field.__name__.replace('.', '-')
-    widget.label = field.title
-    widget.required = field.required
+    setWidgetAttributes(
+        widget,
+        field=field,
+        name=field.__name__,
+        id=field.__name__.replace('.', '-'),
+        label=field.title,
+        required=field.required)
     return widget
 
 